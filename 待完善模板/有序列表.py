@@ -1 +0,0 @@
-import sortedcontainers
\ No newline at end of file
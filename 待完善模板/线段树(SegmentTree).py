@@ -1,126 +0,0 @@
-# --*-- coding:GBK -- * --
-
-
-"""߶ (Segment Tree) (Segment Tree)
-
-˼루Lazy˼룩еĲڽǣִУֱݲѯҪֳ
-
-˵
-
-˵
-self.N = ߶鳤
-self.H = ߶ĸ߶
-self.update_fn = ߶ĺ
-self.query_fn = ѯ߶ĺ
-self.tree = [0] * (2 * N)  # ߶
-self.lazy = [0] * N  # ߶lazy
-
-˵
-SegmentTree(N, update_fn, query_fn) һóΪN߶
-_apply(x, val)
-_pull(x) ҶڵxȽڵֵlazyԣ
-query(l, r) ѯlrֵ
-
-˵
-SegmentTree = ʵֵ߶
-
-"""
-
-
-class SegmentTree(object):
-    def __init__(self, N, update_fn, query_fn):
-        self.N = N
-        self.update_fn = update_fn
-        self.query_fn = query_fn
-
-        # ߶ĸ߶
-        self.H = 1
-        while (1 << self.H) < N:
-            self.H += 1
-
-        # ʼ߶lazy飨lazyԶӦڲڵ㣩
-        self.tree = [0] * (2 * N)
-        self.lazy = [0] * N
-
-    def _apply(self, x, val):
-        """xֵxӽڵļдlazy"""
-        self.tree[x] = self.update_fn(self.tree[x], val)
-        if x < self.N:
-            self.lazy[x] = self.update_fn(self.lazy[x], val)  # ÿڵlazyԶǸӽڵõ
-
-    def _pull(self, x):
-        """ҶڵxȽڵֵ"""
-        while x > 1:
-            x >>= 1
-            self.tree[x] = self.query_fn(self.tree[x * 2], self.tree[x * 2 + 1])
-            self.tree[x] = self.update_fn(self.tree[x], self.lazy[x])
-
-    def _push(self, x):
-        """Ӹڵ¼xȽڵlazyеֵ"""
-        for h in range(self.H, 0, -1):
-            y = x >> h
-            if self.lazy[y]:
-                self._apply(y * 2, self.lazy[y])
-                self._apply(y * 2 + 1, self.lazy[y])
-                self.lazy[y] = 0
-
-    def update(self, l, r, h):
-        # LRӦҶڵ
-        l += self.N
-        r += self.N
-
-        # Ҷڵ㿪ʼϸֵ
-        L0, R0 = l, r
-        while l <= r:
-            print(":", l, r, "->", l & 1, r & 1)
-            if l & 1 == 1:
-                self._apply(l, h)
-                l += 1
-            if r & 1 == 0:
-                self._apply(r, h)
-                r -= 1
-            print("ǰ:", self.tree, self.lazy)
-            l >>= 1
-            r >>= 1
-
-        # ҶڵxȽڵֵ
-        self._pull(L0)
-        self._pull(R0)
-
-        print("", self.tree, self.lazy)
-
-    def query(self, l, r):
-        """ѯLR䣩ֵ"""
-
-        # LRӦҶڵ
-        l += self.N
-        r += self.N
-
-        # Ӹڵ¼xȽڵlazyеֵlazyеֵ㵽ڵУ
-        self._push(l)
-        self._push(r)
-
-        # ѯָΧĺ
-        ans = 0
-        while l <= r:
-            print(l, r, "->", l & 1, r & 1)
-            if l & 1 == 1:
-                ans = self.query_fn(ans, self.tree[l])
-                l += 1
-            if r & 1 == 0:
-                ans = self.query_fn(ans, self.tree[r])
-                r -= 1
-            l >>= 1
-            r >>= 1
-        return ans
-
-
-if __name__ == "__main__":
-    def sum_(a, b):
-        return a + b
-
-
-    st = SegmentTree(8, sum_, sum_)
-    print(st.update(3, 5, 1))
-    # print(st.query(2, 5))
-    # print(st.query(3, 5))
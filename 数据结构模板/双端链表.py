@@ -1,3 +1,9 @@
+import functools
+import heapq
+import itertools
+import time
+
+
 class DoublyLinkedList:
     """双端链表"""
 
@@ -63,10 +69,334 @@ class DoublyLinkedList:
             raise KeyError("empty deque")
         return self.delete_node(self._trailer.prev)
 
-    def __repr__(self):
-        ans = []
+    def __iter__(self):
         node = self._header.next
-        while node.next:
-            ans.append(str(node.val))
+        while node is not self._trailer:
+            yield node.val
             node = node.next
-        return "deque:" + "<->".join(ans)
+
+    def __reversed__(self):
+        node = self._trailer.prev
+        while node is not self._header:
+            yield node.val
+            node = node.prev
+
+    def __repr__(self):
+        return "deque:" + "<->".join(map(str, self))
+
+
+class ArenaDoublyLinkedList:
+    """双端链表（结点池版本）：所有结点的值、前驱、后继分别存储在预先分配的三个数组中，结点用整数编号表示；
+    删除的结点编号放回空闲链表供之后插入时复用，数组空间不足时容量翻倍，插入和删除时不需要创建或销毁结点对象。
+    接口与DoublyLinkedList相同，区别在于结点为整数编号（通过value(node)查询结点的值），删除结点时返回结点的值。"""
+
+    def __init__(self, capacity=16):
+        capacity = max(capacity, 1) + 2
+        self._val = [None] * capacity
+        self._prev = [0] * capacity
+        self._next = list(range(1, capacity + 1))  # 空闲结点之间通过_next串联
+        self._next[0] = 1  # 编号为0、1的结点为头、尾哨兵结点
+        self._prev[1] = 0
+        self._free = 2  # 空闲链表的第一个结点（等于容量时表示没有空闲结点）
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def _grow(self):
+        """容量翻倍，新增的结点加入空闲链表"""
+        n = len(self._val)
+        self._val.extend([None] * n)
+        self._prev.extend([0] * n)
+        self._next.extend(range(n + 1, 2 * n + 1))
+
+    def value(self, node):
+        return self._val[node]
+
+    def first(self):
+        if not self:
+            raise KeyError("empty deque")
+        return self._next[0]
+
+    def last(self):
+        if not self:
+            raise KeyError("empty deque")
+        return self._prev[1]
+
+    def _insert_between(self, val, before, after):
+        newest = self._free
+        if newest == len(self._val):
+            self._grow()
+        nxt = self._next
+        self._free = nxt[newest]
+        self._val[newest] = val
+        self._prev[newest] = before
+        nxt[newest] = after
+        nxt[before] = newest
+        self._prev[after] = newest
+        self._size += 1
+        return newest
+
+    def delete_node(self, node):
+        nxt, prev = self._next, self._prev
+        before, after = prev[node], nxt[node]
+        nxt[before] = after
+        prev[after] = before
+        val = self._val[node]
+        self._val[node] = None
+        nxt[node] = self._free
+        self._free = node
+        self._size -= 1
+        return val
+
+    def insert_first(self, val):
+        return self._insert_between(val, 0, self._next[0])
+
+    def insert_last(self, val):
+        return self._insert_between(val, self._prev[1], 1)
+
+    def delete_first(self):
+        if not self._size:
+            raise KeyError("empty deque")
+        nxt, prev = self._next, self._prev
+        node = nxt[0]
+        after = nxt[node]
+        nxt[0] = after
+        prev[after] = 0
+        val = self._val[node]
+        self._val[node] = None
+        nxt[node] = self._free
+        self._free = node
+        self._size -= 1
+        return val
+
+    def delete_last(self):
+        if not self._size:
+            raise KeyError("empty deque")
+        nxt, prev = self._next, self._prev
+        node = prev[1]
+        before = prev[node]
+        nxt[before] = 1
+        prev[1] = before
+        val = self._val[node]
+        self._val[node] = None
+        nxt[node] = self._free
+        self._free = node
+        self._size -= 1
+        return val
+
+    def __iter__(self):
+        val, nxt = self._val, self._next
+        node = nxt[0]
+        while node != 1:
+            yield val[node]
+            node = nxt[node]
+
+    def __reversed__(self):
+        val, prev = self._val, self._prev
+        node = prev[1]
+        while node != 0:
+            yield val[node]
+            node = prev[node]
+
+    def __repr__(self):
+        return "deque:" + "<->".join(map(str, self))
+
+
+class _Cache:
+    """缓存的公共部分：命中、未命中、淘汰次数统计，以及作为函数装饰器使用（记忆化）"""
+
+    _MISSING = object()
+    _KWARGS_MARK = object()  # 记忆化的键中位置参数与关键字参数之间的分隔标记
+
+    def __init__(self, capacity, ttl=None, on_evict=None):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.ttl = ttl  # 默认的过期时间（秒），None为永不过期
+        self.on_evict = on_evict  # 淘汰回调函数：on_evict(key, value)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = {}  # 键 -> 链表结点
+        self._expiry = []  # 过期时间的最小堆[(过期时间, 序号, 键)]（键被删除或重新写入后原有的项作废）
+        self._counter = itertools.count()
+
+    def __len__(self):
+        self._purge()
+        return len(self._entries)
+
+    def __contains__(self, key):
+        node = self._entries.get(key)
+        return node is not None and not self._expired(node.val[2])
+
+    def _expire_at(self, key, ttl):
+        """计算键的过期时间，并将其加入过期时间的最小堆"""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl is None:
+            return None
+        expire = time.monotonic() + ttl
+        expiry = self._expiry
+        if len(expiry) > 2 * len(self._entries) + 16:  # 作废的项过多时重建堆
+            expiry[:] = [(node.val[2], next(self._counter), k)
+                         for k, node in self._entries.items() if node.val[2] is not None]
+            heapq.heapify(expiry)
+        heapq.heappush(expiry, (expire, next(self._counter), key))
+        return expire
+
+    def _purge(self):
+        """删除所有已过期的元素（不计入淘汰次数），使容量和元素数量只计算未过期的元素"""
+        expiry = self._expiry
+        if not expiry:
+            return
+        now = time.monotonic()
+        while expiry and expiry[0][0] <= now:
+            expire, _, key = heapq.heappop(expiry)
+            node = self._entries.get(key)
+            if node is not None and node.val[2] == expire:
+                del self._entries[key]
+                self._remove(node)
+
+    def _remove(self, node):
+        """从链表中删除结点"""
+        raise NotImplementedError
+
+    @staticmethod
+    def _expired(expire):
+        return expire is not None and expire <= time.monotonic()
+
+    def _evicted(self, key, value):
+        self.evictions += 1
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+
+    def __call__(self, func):
+        """作为装饰器使用：缓存函数的返回值（函数参数需要可哈希）"""
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = args + (self._KWARGS_MARK,) + tuple(sorted(kwargs.items())) if kwargs else args
+            value = self.get(key, self._MISSING)
+            if value is self._MISSING:
+                value = func(*args, **kwargs)
+                self.put(key, value)
+            return value
+
+        wrapper.cache = self
+        return wrapper
+
+
+class LRUCache(_Cache):
+    """最近最少使用缓存：链表从头到尾按最近使用时间排列，淘汰链表头部的元素；所有操作均为O(1)（设置过期时间的写入为O(logN)）"""
+
+    def __init__(self, capacity, ttl=None, on_evict=None):
+        super().__init__(capacity, ttl, on_evict)
+        self._list = DoublyLinkedList()  # 结点的值为[键, 值, 过期时间]
+
+    def _remove(self, node):
+        self._list.delete_node(node)
+
+    def get(self, key, default=None, count=True):
+        node = self._entries.get(key)
+        if node is not None and self._expired(node.val[2]):
+            self._list.delete_node(node)
+            del self._entries[key]
+            node = None
+        if node is None:
+            if count:
+                self.misses += 1
+            return default
+        if count:
+            self.hits += 1
+        self._list.delete_node(node)
+        self._entries[key] = self._list.insert_last(node.val)
+        return node.val[1]
+
+    def put(self, key, value, ttl=None):
+        self._purge()
+        node = self._entries.pop(key, None)
+        if node is not None:
+            self._list.delete_node(node)
+        self._entries[key] = self._list.insert_last([key, value, self._expire_at(key, ttl)])
+        if len(self._entries) > self.capacity:
+            old_key, old_value, _ = self._list.delete_first().val
+            del self._entries[old_key]
+            self._evicted(old_key, old_value)
+
+    def pop(self, key, default=None):
+        node = self._entries.pop(key, None)
+        if node is None:
+            return default
+        self._list.delete_node(node)
+        return node.val[1]
+
+
+class LFUCache(_Cache):
+    """最不经常使用缓存：为每个使用次数维护一个链表（按最近使用时间排列），淘汰使用次数最少的链表头部的元素；所有操作均为O(1)（设置过期时间的写入为O(logN)）"""
+
+    def __init__(self, capacity, ttl=None, on_evict=None):
+        super().__init__(capacity, ttl, on_evict)
+        self._lists = {}  # 使用次数 -> 链表，结点的值为[键, 值, 过期时间, 使用次数]
+        self._min_freq = 0
+
+    def _remove(self, node):
+        self._unlink(node)
+
+    def _unlink(self, node):
+        freq = node.val[3]
+        lst = self._lists[freq]
+        lst.delete_node(node)
+        if not lst:
+            del self._lists[freq]
+            if self._min_freq == freq:
+                self._min_freq += 1
+
+    def _link(self, item):
+        freq = item[3]
+        if freq not in self._lists:
+            self._lists[freq] = DoublyLinkedList()
+        return self._lists[freq].insert_last(item)
+
+    def get(self, key, default=None, count=True):
+        node = self._entries.get(key)
+        if node is not None and self._expired(node.val[2]):
+            self._unlink(node)
+            del self._entries[key]
+            node = None
+        if node is None:
+            if count:
+                self.misses += 1
+            return default
+        if count:
+            self.hits += 1
+        self._unlink(node)
+        node.val[3] += 1
+        self._entries[key] = self._link(node.val)
+        return node.val[1]
+
+    def put(self, key, value, ttl=None):
+        self._purge()
+        node = self._entries.get(key)
+        if node is not None:
+            node.val[1] = value
+            node.val[2] = self._expire_at(key, ttl)
+            self.get(key, count=False)
+            return
+        if len(self._entries) >= self.capacity:
+            if self._min_freq not in self._lists:  # 删除或过期后使用次数最少的链表可能已被删除
+                self._min_freq = min(self._lists)
+            old_key, old_value, _, _ = self._lists[self._min_freq].first().val
+            self._unlink(self._entries.pop(old_key))
+            self._evicted(old_key, old_value)
+        self._entries[key] = self._link([key, value, self._expire_at(key, ttl), 1])
+        self._min_freq = 1
+
+    def pop(self, key, default=None):
+        node = self._entries.pop(key, None)
+        if node is None:
+            return default
+        self._unlink(node)
+        return node.val[1]
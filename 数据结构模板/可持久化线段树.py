@@ -0,0 +1,134 @@
+"""可持久化线段树 (Persistent Segment Tree)
+
+每次更新时只复制从根结点到被修改结点的路径上的结点（路径复制），其余结点与上一个版本共享，
+因此每次更新只增加O(logN)个结点，并且可以查询任意历史版本。
+所有结点存储在数组中，编号为0的结点为空结点（值为0，左右子结点均为它本身），因此位置范围可以很大（延时开点）。
+
+【时间复杂度】
+区间更新：O(logN)（新增O(logN)个结点）
+查询任意版本的区间结果：O(logN)
+
+【PersistentSegmentTreeForMax方法说明】
+PersistentSegmentTreeForMax(size) 构造位置范围为[0, size]、初始值为0的求最大值可持久化线段树（初始版本为0）
+version() 返回最新版本的版本号
+update_range(start, end, data, v=None) 在版本v（默认为最新版本）的基础上，将[start, end]中的值更新为与data的最大值，返回新版本号
+update_one(query, data, v=None) 单点更新，返回新版本号
+query_range(v, start, end) 查询版本v中[start, end]的最大值
+query_one(v, query) 查询版本v中位置query的值
+
+【RangeKthSmallest方法说明】（主席树）
+RangeKthSmallest(nums) 依据数组nums构造：第i个版本为插入nums[0]到nums[i-1]后的值域线段树
+kth_smallest(l, r, k) 查询nums[l]到nums[r]（闭区间）中第k小（k从1开始）的值:O(logN)
+"""
+
+
+class PersistentSegmentTreeForMax:
+    """求最大值可持久化线段树：区间更新使用标记永久化，不需要下传懒惰计算标签"""
+
+    def __init__(self, size):
+        self.size = size
+        self._left = [0]  # 结点左子结点
+        self._right = [0]  # 结点右子结点
+        self._val = [0]  # 结点对应区间的最大值（包含当前结点及子孙结点上的标记）
+        self._tag = [0]  # 永久化的懒惰计算标签（作用于整个结点对应的区间）
+        self._roots = [0]  # 各个版本的根结点
+
+    def version(self):
+        return len(self._roots) - 1
+
+    def _copy(self, x):
+        self._left.append(self._left[x])
+        self._right.append(self._right[x])
+        self._val.append(self._val[x])
+        self._tag.append(self._tag[x])
+        return len(self._val) - 1
+
+    def _update(self, x, lo, hi, start, end, data):
+        y = self._copy(x)
+        if data > self._val[y]:
+            self._val[y] = data
+        if start <= lo and hi <= end:
+            if data > self._tag[y]:
+                self._tag[y] = data
+            return y
+        mid = (lo + hi) // 2
+        if start <= mid:
+            self._left[y] = self._update(self._left[x], lo, mid, start, end, data)
+        if end > mid:
+            self._right[y] = self._update(self._right[x], mid + 1, hi, start, end, data)
+        return y
+
+    def _query(self, x, lo, hi, start, end):
+        if x == 0 or (start <= lo and hi <= end):
+            return self._val[x]
+        ans = self._tag[x]
+        mid = (lo + hi) // 2
+        if start <= mid:
+            ans = max(ans, self._query(self._left[x], lo, mid, start, end))
+        if end > mid:
+            ans = max(ans, self._query(self._right[x], mid + 1, hi, start, end))
+        return ans
+
+    def update_range(self, start, end, data, v=None):
+        if v is None:
+            v = self.version()
+        self._roots.append(self._update(self._roots[v], 0, self.size, start, end, data))
+        return self.version()
+
+    def update_one(self, query, data, v=None):
+        return self.update_range(query, query, data, v)
+
+    def query_range(self, v, start, end):
+        return self._query(self._roots[v], 0, self.size, start, end)
+
+    def query_one(self, v, query):
+        return self._query(self._roots[v], 0, self.size, query, query)
+
+
+class RangeKthSmallest:
+    """主席树：第i个版本为插入nums的前i个元素后的值域线段树，两个版本相减即为子数组的值域线段树"""
+
+    def __init__(self, nums):
+        self._values = sorted(set(nums))
+        index = {v: i for i, v in enumerate(self._values)}
+        self._m = len(self._values)
+        self._left = [0]
+        self._right = [0]
+        self._cnt = [0]  # 结点对应值域中的元素数量
+        self._roots = [0]
+        for num in nums:
+            self._roots.append(self._insert(self._roots[-1], 0, self._m - 1, index[num]))
+
+    def _insert(self, x, lo, hi, i):
+        """在版本结点x的基础上插入第i小的值，返回新的结点（非递归路径复制）"""
+        left, right, cnt = self._left, self._right, self._cnt
+        root = y = len(cnt)
+        while True:
+            left.append(left[x])
+            right.append(right[x])
+            cnt.append(cnt[x] + 1)
+            if lo == hi:
+                return root
+            mid = (lo + hi) // 2
+            if i <= mid:
+                left[y] = y + 1
+                x, hi = left[x], mid
+            else:
+                right[y] = y + 1
+                x, lo = right[x], mid + 1
+            y += 1
+
+    def kth_smallest(self, l, r, k):
+        """查询nums[l]到nums[r]（闭区间）中第k小的值"""
+        left, right, cnt = self._left, self._right, self._cnt
+        x, y = self._roots[l], self._roots[r + 1]
+        lo, hi = 0, self._m - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            c = cnt[left[y]] - cnt[left[x]]
+            if k <= c:
+                x, y, hi = left[x], left[y], mid
+            else:
+                k -= c
+                x, y, lo = right[x], right[y], mid + 1
+        return self._values[lo]
@@ -0,0 +1,150 @@
+"""可撤销并查集 (Rollback Disjoint Set Union)
+
+在定长并查集的基础上支持撤销合并操作：不使用路径压缩，仅依据节点数量选择领导者（按秩合并），
+保证树高不超过O(logN)，从而每次合并只修改两个位置，可以依据操作记录逐个撤销。
+
+【时间复杂度】
+构造实例：O(N)
+查询元素所在集合：O(logN)
+合并两个元素所在集合：O(logN)
+记录检查点：O(1)
+撤销到检查点：O(K)（其中K为需要撤销的合并次数）
+
+【方法说明】
+RollbackDSU(n) 构造长度为n的可撤销并查集实例
+find(i) 查询i所属的连通分支
+union(i,j) 合并i和j的连通分支
+is_connected(i,j) 判断i和j是否在同一个连通分支
+group_num 计算当前的连通分支数量
+snapshot() 记录当前状态，返回检查点
+rollback(checkpoint) 撤销检查点之后的所有合并操作
+
+【离线动态连通性】
+offline_dynamic_connectivity(n, operations) 线段树分治，回答带删除边的连通性查询:O((N+Q)log²N)
+operations为按时间排序的操作列表，每个操作为(t, op, u, v)，其中op为：
+"add" = 添加边(u,v)
+"remove" = 删除边(u,v)（同一条边可以重复添加，删除时删除最早仍存在的一条）
+"query" = 查询u和v是否连通
+返回所有查询的结果列表
+"""
+
+
+class RollbackDSU:
+    def __init__(self, n: int):
+        self._n = n
+        self._array = [i for i in range(n)]
+        self._size = [1] * n
+        self._group_num = n
+        self._history = []  # 合并记录：被合并的连通分支的根节点
+
+    def find(self, i: int) -> int:
+        """查询i所在的连通分支:O(logN)"""
+        array = self._array
+        while array[i] != i:
+            i = array[i]
+        return i
+
+    def union(self, i: int, j: int) -> bool:
+        """合并i和j所属的连通分支:O(logN)"""
+        i, j = self.find(i), self.find(j)
+        if i == j:
+            return False
+        if self._size[i] < self._size[j]:
+            i, j = j, i
+        self._array[j] = i
+        self._size[i] += self._size[j]
+        self._group_num -= 1
+        self._history.append(j)
+        return True
+
+    def is_connected(self, i: int, j: int) -> bool:
+        return self.find(i) == self.find(j)
+
+    @property
+    def group_num(self) -> int:
+        """计算连通分支数量:O(1)"""
+        return self._group_num
+
+    def snapshot(self) -> int:
+        """记录当前状态的检查点:O(1)"""
+        return len(self._history)
+
+    def rollback(self, checkpoint: int):
+        """撤销到检查点checkpoint:O(K)"""
+        history, array, size = self._history, self._array, self._size
+        while len(history) > checkpoint:
+            j = history.pop()
+            i = array[j]
+            array[j] = j
+            size[i] -= size[j]
+            self._group_num += 1
+
+
+def offline_dynamic_connectivity(n: int, operations):
+    """线段树分治：离线回答带删除边的连通性查询"""
+    operations = sorted(operations, key=lambda x: x[0])
+
+    # 计算每条边的存在区间（以查询编号为时间轴，左闭右开）
+    queries = []
+    intervals = []
+    start = {}
+    for _, op, u, v in operations:
+        if u > v:
+            u, v = v, u
+        if op == "add":
+            start.setdefault((u, v), []).append(len(queries))
+        elif op == "remove":
+            if not start.get((u, v)):
+                raise KeyError("edge not exists")
+            intervals.append((start[(u, v)].pop(0), len(queries), u, v))
+        else:
+            queries.append((u, v))
+    for (u, v), lst in start.items():
+        for l in lst:
+            intervals.append((l, len(queries), u, v))
+
+    q = len(queries)
+    if q == 0:
+        return []
+
+    # 将边的存在区间挂载到线段树的结点上
+    size = 1
+    while size < q:
+        size <<= 1
+    edges = [[] for _ in range(2 * size)]
+    for l, r, u, v in intervals:
+        l += size
+        r += size
+        while l < r:
+            if l & 1:
+                edges[l].append((u, v))
+                l += 1
+            if r & 1:
+                r -= 1
+                edges[r].append((u, v))
+            l >>= 1
+            r >>= 1
+
+    # 非递归深度优先遍历线段树：进入结点时合并，离开结点时撤销
+    dsu = RollbackDSU(n)
+    ans = [False] * q
+    stack = [1]
+    checkpoints = [0] * (2 * size)
+    while stack:
+        x = stack.pop()
+        if x < 0:
+            dsu.rollback(checkpoints[~x])
+            continue
+        if (x << (size.bit_length() - x.bit_length())) - size >= q:
+            continue  # 结点对应的时间段中没有查询
+        checkpoints[x] = dsu.snapshot()
+        for u, v in edges[x]:
+            dsu.union(u, v)
+        stack.append(~x)
+        if x >= size:
+            u, v = queries[x - size]
+            ans[x - size] = dsu.is_connected(u, v)
+        else:
+            stack.append(2 * x + 1)
+            stack.append(2 * x)
+    return ans
@@ -0,0 +1,185 @@
+"""吉司机线段树 (Segment Tree Beats)
+
+在区间取最小值(chmin)、区间取最大值(chmax)的同时维护区间和。
+每个结点记录最大值、严格次大值、最大值的数量，以及最小值、严格次小值、最小值的数量：
+区间取最小值x时，如果结点的次大值 < x < 最大值，则只有最大值会被修改，可以直接用最大值的数量更新区间和，不需要继续向下递归；
+只有当x <= 次大值时才继续向下递归，根据势能分析，这样的递归次数是有限的（区间取最大值同理）。
+
+【时间复杂度】
+构造实例：O(N)
+区间取最小值、区间取最大值：O(log²N)*
+区间加：O(log²N)*
+区间和、区间最小值、区间最大值：O(logN)
+（其中：*为摊销）
+
+【方法说明】
+SegmentTreeBeats(values) 构造线段树，values为初始数组或数组长度（初始值为0）
+range_chmin(l, r, x) 将第l个到第r个位置（闭区间）的值a[i]修改为min(a[i], x)
+range_chmax(l, r, x) 将第l个到第r个位置（闭区间）的值a[i]修改为max(a[i], x)
+range_add(l, r, x) 将第l个到第r个位置（闭区间）的值均增加x
+range_sum(l, r) 查询第l个到第r个位置（闭区间）的值之和
+range_min(l, r) 查询第l个到第r个位置（闭区间）的最小值
+range_max(l, r) 查询第l个到第r个位置（闭区间）的最大值
+"""
+
+INF = float("inf")
+
+
+class SegmentTreeBeats:
+    def __init__(self, values):
+        if isinstance(values, int):
+            values = [0] * values
+        self.n = len(values)
+        self.log = max(self.n - 1, 0).bit_length()
+        self.size = 1 << self.log
+        size = self.size
+
+        self.max1 = [-INF] * (2 * size)  # 最大值
+        self.max2 = [-INF] * (2 * size)  # 严格次大值
+        self.max_cnt = [0] * (2 * size)  # 最大值的数量
+        self.min1 = [INF] * (2 * size)  # 最小值
+        self.min2 = [INF] * (2 * size)  # 严格次小值
+        self.min_cnt = [0] * (2 * size)  # 最小值的数量
+        self.sum = [0] * (2 * size)  # 区间和
+        self.length = [0] * (2 * size)  # 结点包含的有效位置数量
+        self.lazy = [0] * (2 * size)  # 区间加的懒惰标签
+
+        for i, v in enumerate(values):
+            x = size + i
+            self.max1[x] = self.min1[x] = self.sum[x] = v
+            self.max_cnt[x] = self.min_cnt[x] = self.length[x] = 1
+        for x in range(size - 1, 0, -1):
+            self.length[x] = self.length[2 * x] + self.length[2 * x + 1]
+            self._pull(x)
+
+    def _pull(self, x):
+        """由子结点重新计算结点x的值"""
+        l, r = 2 * x, 2 * x + 1
+        max1, max2, max_cnt = self.max1, self.max2, self.max_cnt
+        min1, min2, min_cnt = self.min1, self.min2, self.min_cnt
+        self.sum[x] = self.sum[l] + self.sum[r]
+
+        if max1[l] > max1[r]:
+            max1[x], max_cnt[x], max2[x] = max1[l], max_cnt[l], max(max2[l], max1[r])
+        elif max1[l] < max1[r]:
+            max1[x], max_cnt[x], max2[x] = max1[r], max_cnt[r], max(max1[l], max2[r])
+        else:
+            max1[x], max_cnt[x], max2[x] = max1[l], max_cnt[l] + max_cnt[r], max(max2[l], max2[r])
+
+        if min1[l] < min1[r]:
+            min1[x], min_cnt[x], min2[x] = min1[l], min_cnt[l], min(min2[l], min1[r])
+        elif min1[l] > min1[r]:
+            min1[x], min_cnt[x], min2[x] = min1[r], min_cnt[r], min(min1[l], min2[r])
+        else:
+            min1[x], min_cnt[x], min2[x] = min1[l], min_cnt[l] + min_cnt[r], min(min2[l], min2[r])
+
+    def _apply_chmin(self, x, v):
+        """将结点x的最大值修改为v（要求：次大值 < v < 最大值）"""
+        self.sum[x] += (v - self.max1[x]) * self.max_cnt[x]
+        if self.max1[x] == self.min1[x]:
+            self.min1[x] = v
+        elif self.max1[x] == self.min2[x]:
+            self.min2[x] = v
+        self.max1[x] = v
+
+    def _apply_chmax(self, x, v):
+        """将结点x的最小值修改为v（要求：最小值 < v < 次小值）"""
+        self.sum[x] += (v - self.min1[x]) * self.min_cnt[x]
+        if self.min1[x] == self.max1[x]:
+            self.max1[x] = v
+        elif self.min1[x] == self.max2[x]:
+            self.max2[x] = v
+        self.min1[x] = v
+
+    def _apply_add(self, x, v):
+        """将结点x中的所有值增加v"""
+        self.max1[x] += v
+        self.max2[x] += v
+        self.min1[x] += v
+        self.min2[x] += v
+        self.sum[x] += v * self.length[x]
+        self.lazy[x] += v
+
+    def _push(self, x):
+        """将结点x的懒惰标签下传到子结点"""
+        for y in (2 * x, 2 * x + 1):
+            if self.length[y] == 0:
+                continue
+            if self.lazy[x]:
+                self._apply_add(y, self.lazy[x])
+            if self.max1[y] > self.max1[x]:
+                self._apply_chmin(y, self.max1[x])
+            if self.min1[y] < self.min1[x]:
+                self._apply_chmax(y, self.min1[x])
+        self.lazy[x] = 0
+
+    def _chmin(self, x, lo, hi, l, r, v):
+        if r < lo or hi < l or self.max1[x] <= v:
+            return
+        if l <= lo and hi <= r and self.max2[x] < v:
+            self._apply_chmin(x, v)
+            return
+        self._push(x)
+        mid = (lo + hi) // 2
+        self._chmin(2 * x, lo, mid, l, r, v)
+        self._chmin(2 * x + 1, mid + 1, hi, l, r, v)
+        self._pull(x)
+
+    def _chmax(self, x, lo, hi, l, r, v):
+        if r < lo or hi < l or self.min1[x] >= v:
+            return
+        if l <= lo and hi <= r and self.min2[x] > v:
+            self._apply_chmax(x, v)
+            return
+        self._push(x)
+        mid = (lo + hi) // 2
+        self._chmax(2 * x, lo, mid, l, r, v)
+        self._chmax(2 * x + 1, mid + 1, hi, l, r, v)
+        self._pull(x)
+
+    def _add(self, x, lo, hi, l, r, v):
+        if r < lo or hi < l or self.length[x] == 0:
+            return
+        if l <= lo and hi <= r:
+            self._apply_add(x, v)
+            return
+        self._push(x)
+        mid = (lo + hi) // 2
+        self._add(2 * x, lo, mid, l, r, v)
+        self._add(2 * x + 1, mid + 1, hi, l, r, v)
+        self._pull(x)
+
+    def _query(self, x, lo, hi, l, r, kind):
+        if l <= lo and hi <= r:
+            if kind == 0:
+                return self.sum[x]
+            return self.min1[x] if kind == 1 else self.max1[x]
+        self._push(x)
+        mid = (lo + hi) // 2
+        if r <= mid:
+            return self._query(2 * x, lo, mid, l, r, kind)
+        if l > mid:
+            return self._query(2 * x + 1, mid + 1, hi, l, r, kind)
+        a = self._query(2 * x, lo, mid, l, r, kind)
+        b = self._query(2 * x + 1, mid + 1, hi, l, r, kind)
+        if kind == 0:
+            return a + b
+        return min(a, b) if kind == 1 else max(a, b)
+
+    def range_chmin(self, l, r, x):
+        self._chmin(1, 0, self.size - 1, l, r, x)
+
+    def range_chmax(self, l, r, x):
+        self._chmax(1, 0, self.size - 1, l, r, x)
+
+    def range_add(self, l, r, x):
+        self._add(1, 0, self.size - 1, l, r, x)
+
+    def range_sum(self, l, r):
+        return self._query(1, 0, self.size - 1, l, r, 0)
+
+    def range_min(self, l, r):
+        return self._query(1, 0, self.size - 1, l, r, 1)
+
+    def range_max(self, l, r):
+        return self._query(1, 0, self.size - 1, l, r, 2)
@@ -1,10 +1,23 @@
+import mmap
+import sys
+from array import array
+from bisect import bisect_left
+
+
 class Trie:
+    """字典树
+
+    每个结点记录以该结点为前缀的所有词语的权重之和(weight)，以及以该结点结尾的词语的权重(count)；
+    top_k查询的结果缓存在结点上(top)，添加、移除词语时只需要使路径上结点的缓存失效。"""
+
     class _Node:
-        __slots__ = "value", "weight", "children"
+        __slots__ = "value", "weight", "count", "top", "children"
 
         def __init__(self):
             self.value = None
-            self.weight = 0
+            self.weight = 0  # 子树中所有词语的权重之和
+            self.count = 0  # 以当前结点结尾的词语的权重
+            self.top = None  # top_k缓存:(缓存的k, 按权重降序排列的[(权重, 词语)])
             self.children = {}
 
         def __contains__(self, ch):
@@ -19,14 +32,18 @@ class Trie:
     def __init__(self):
         self.root = self._Node()
 
-    def add(self, word):
-        """向字典树中添加词语:True=成功添加;False=已有该词"""
+    def add(self, word, weight=1):
+        """向字典树中添加词语（若已有该词则增加权重）:True=成功添加;False=已有该词"""
         node = self.root
+        node.weight += weight
+        node.top = None
         for ch in word:
             if ch not in node:
                 node[ch] = self._Node()
-            node.weight += 1
             node = node[ch]
+            node.weight += weight
+            node.top = None
+        node.count += weight
         if node.value is None:
             node.value = word
             return True
@@ -34,13 +51,30 @@ class Trie:
             return False
 
     def remove(self, word, weight=1):
-        """从字典树中移除词数(并不是真的删除，而是移除权重):True=成功移除;False=没有该词"""
-        node = self.root
+        """从字典树中移除词语的权重（权重减为0时删除该词）:True=成功移除;False=没有该词"""
+        path = [self.root]
         for ch in word:
-            if ch not in node:
+            if ch not in path[-1]:
                 return False
-            node.weight -= weight
-            node = node[ch]
+            path.append(path[-1][ch])
+        node = path[-1]
+        if node.value is None:
+            return False
+
+        weight = min(weight, node.count)
+        node.count -= weight
+        if node.count == 0:
+            node.value = None
+        for x in path:
+            x.weight -= weight
+            x.top = None
+
+        # 删除权重为0的结点
+        for i, ch in enumerate(word):
+            if path[i + 1].weight == 0:
+                del path[i].children[ch]
+                break
+        return True
 
     def __contains__(self, word):
         """判断词语是否存在"""
@@ -69,3 +103,360 @@ class Trie:
                 return False
             node = node[ch]
         return True
+
+    def _find(self, prefix):
+        node = self.root
+        for ch in prefix:
+            if ch not in node:
+                return None
+            node = node[ch]
+        return node
+
+    def iter_prefix(self, prefix=""):
+        """按字典序依次返回所有以prefix开头的词语"""
+        node = self._find(prefix)
+        if node is None:
+            return
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.value is not None:
+                yield node.value
+            stack.extend(node.children[ch] for ch in sorted(node.children, reverse=True))
+
+    def _top(self, node, k):
+        """计算node子树中权重最大的k个词语（使用并更新结点缓存；非递归后序遍历，只访问缓存失效的结点）"""
+        stack = [(node, False)]
+        while stack:
+            x, expanded = stack.pop()
+            if x.top is not None and x.top[0] >= k:
+                continue
+            if not expanded:
+                stack.append((x, True))
+                stack.extend((child, False) for child in x.children.values())
+                continue
+            candidates = [(x.count, x.value)] if x.value is not None else []
+            for child in x.children.values():
+                candidates.extend(child.top[1][:k])
+            candidates.sort(key=lambda c: (-c[0], c[1]))
+            best = candidates[:k]
+            x.top = (k if len(best) == k else float("inf"), best)
+        return node.top[1][:k]
+
+    def top_k(self, prefix, k):
+        """查询以prefix开头的权重最大的k个词语，返回[(词语, 权重)]:O(|prefix|+k)（缓存命中时）"""
+        node = self._find(prefix)
+        if node is None or k <= 0:
+            return []
+        return [(word, weight) for weight, word in self._top(node, k)]
+
+
+class AhoCorasick(Trie):
+    """AC自动机：在字典树上构造失配指针，一次扫描文本即可找出所有词语的所有出现位置:O(N+M)（M为匹配数量）
+    文本可以是字符串、字符串片段的迭代器或可读的文件对象，匹配结果按出现的结束位置依次惰性返回。"""
+
+    class _Node(Trie._Node):
+        __slots__ = "fail", "out"
+
+        def __init__(self):
+            super().__init__()
+            self.fail = None  # 失配指针：当前结点对应字符串的最长真后缀结点
+            self.out = None  # 输出指针：沿失配指针能够到达的最近的词语结尾结点
+
+    def __init__(self):
+        super().__init__()
+        self._built = False
+
+    def add(self, word, weight=1):
+        self._built = False
+        return super().add(word, weight)
+
+    def remove(self, word, weight=1):
+        self._built = False
+        return super().remove(word, weight)
+
+    def build(self):
+        """广度优先遍历字典树，计算所有结点的失配指针和输出指针"""
+        root = self.root
+        root.fail = root
+        queue = []
+        for child in root.children.values():
+            child.fail = root
+            child.out = None
+            queue.append(child)
+        for node in queue:
+            for ch, child in node.children.items():
+                fail = node.fail
+                while fail is not root and ch not in fail:
+                    fail = fail.fail
+                child.fail = fail[ch] if ch in fail else root
+                child.out = child.fail if child.fail.value is not None else child.fail.out
+                queue.append(child)
+        self._built = True
+
+    @staticmethod
+    def _read_chunks(stream, chunk_size):
+        """分块读取文件，读到空字符串（或空字节串）时结束"""
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def finditer(self, stream, chunk_size=1 << 16):
+        """扫描文本中所有词语的出现位置，依次返回(开始位置, 词语)"""
+        if not self._built:
+            self.build()
+        if isinstance(stream, str):
+            chunks = (stream,)
+        elif hasattr(stream, "read"):
+            chunks = self._read_chunks(stream, chunk_size)
+        else:
+            chunks = stream
+
+        root = node = self.root
+        pos = 0
+        for chunk in chunks:
+            if isinstance(chunk, (bytes, bytearray)):
+                raise TypeError("finditer() requires text; open the file in text mode or wrap it with io.TextIOWrapper")
+            for ch in chunk:
+                while node is not root and ch not in node.children:
+                    node = node.fail
+                node = node.children.get(ch, root)
+                match = node if node.value is not None else node.out
+                while match is not None:
+                    yield pos - len(match.value) + 1, match.value
+                    match = match.out
+                pos += 1
+
+
+class CompactTrie:
+    """紧凑字典树：所有结点使用连续整数编号，所有边存储在同一个字典中（键为 结点编号<<21|字符编码），
+    结点的结束标记存储在bytearray中。不再为每个结点创建对象和子结点字典，内存占用和对象分配次数大幅减少。
+    接口与Trie相同，另支持通过from_sorted(words)由有序词语列表批量构造。"""
+
+    _SHIFT = 21  # Unicode字符编码的最大值小于2^21
+
+    def __init__(self):
+        self._children = {}  # 结点编号<<21|字符编码 -> 子结点编号
+        self._end = bytearray(1)  # 结点是否为词语结尾（根结点编号为0）
+
+    @classmethod
+    def from_sorted(cls, words):
+        """由字典序排列的词语列表批量构造字典树：相邻词语的公共前缀部分无需重复查找"""
+        trie = cls()
+        children, end, shift = trie._children, trie._end, cls._SHIFT
+        path = [0]  # 上一个词语经过的结点编号
+        last = ""
+        for word in words:
+            # 计算与上一个词语的公共前缀长度
+            k, n = 0, min(len(word), len(last))
+            while k < n and word[k] == last[k]:
+                k += 1
+            del path[k + 1:]
+            node = path[-1]
+            for ch in word[k:]:
+                key = node << shift | ord(ch)
+                if key in children:
+                    node = children[key]
+                else:
+                    node = children[key] = len(end)
+                    end.append(0)
+                path.append(node)
+            end[node] = 1
+            last = word
+        return trie
+
+    def add(self, word):
+        """向字典树中添加词语:True=成功添加;False=已有该词"""
+        children, end, shift = self._children, self._end, self._SHIFT
+        node = 0
+        for ch in word:
+            key = node << shift | ord(ch)
+            if key in children:
+                node = children[key]
+            else:
+                node = children[key] = len(end)
+                end.append(0)
+        if end[node]:
+            return False
+        end[node] = 1
+        return True
+
+    def _walk(self, word):
+        """返回word对应的结点编号（如果不存在则返回-1）"""
+        children, shift = self._children, self._SHIFT
+        node = 0
+        for ch in word:
+            node = children.get(node << shift | ord(ch), -1)
+            if node < 0:
+                return -1
+        return node
+
+    def __contains__(self, word):
+        """判断词语是否存在"""
+        node = self._walk(word)
+        return node >= 0 and self._end[node] == 1
+
+    def search(self, string):
+        """寻找字符串中从头开始的第1个词语（如果没有找到则返回None）"""
+        children, end, shift = self._children, self._end, self._SHIFT
+        node = 0
+        for i, ch in enumerate(string):
+            node = children.get(node << shift | ord(ch), -1)
+            if node < 0:
+                return None
+            if end[node]:
+                return string[:i + 1]
+
+    def start_with(self, string):
+        """寻找字符串中是否有以string开头的"""
+        return self._walk(string) >= 0
+
+
+class MappedTrie:
+    """内存映射字典树：将已构造的字典树（Trie或CompactTrie）冻结为扁平的二进制文件，再以只读方式通过mmap打开。
+    查询直接在映射的缓冲区上进行，无需反序列化；同一台机器上的多个进程共享相同的物理内存页。
+
+    文件格式（均为小端序uint32，结点按广度优先顺序编号，根结点编号为0）：
+    头部 : b"TRIE", 版本号, 结点数量N, 边数量M
+    offsets[N+1] : 结点i的边为edges[offsets[i]:offsets[i+1]]
+    codes[M] : 边对应的字符编码（同一结点的边按编码升序排列）
+    targets[M] : 边指向的子结点编号
+    ends[N] : 结点是否为词语结尾（uint8）"""
+
+    _MAGIC = b"TRIE"
+    _VERSION = 1
+
+    def __init__(self, path):
+        if sys.byteorder != "little":
+            raise OSError("MappedTrie only supports little-endian platforms")
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._mmap)
+        views = []
+        try:
+            if len(buffer) < 16 or bytes(buffer[:4]) != self._MAGIC:
+                raise ValueError("not a trie snapshot: %s" % path)
+            header = buffer[:16].cast("I")
+            version, n, m = header[1], header[2], header[3]
+            header.release()
+            if version != self._VERSION:
+                raise ValueError("unsupported trie snapshot version: %d" % version)
+            if len(buffer) != 16 + 4 * (n + 1) + 8 * m + n:
+                raise ValueError("truncated or corrupted trie snapshot: %s" % path)
+            p = 16
+            views.append(buffer[p:p + 4 * (n + 1)].cast("I"))
+            p += 4 * (n + 1)
+            views.append(buffer[p:p + 4 * m].cast("I"))
+            p += 4 * m
+            views.append(buffer[p:p + 4 * m].cast("I"))
+            p += 4 * m
+            views.append(buffer[p:p + n])
+        except BaseException:
+            for view in views:
+                view.release()
+            buffer.release()
+            self._mmap.close()
+            raise
+        self._offsets, self._codes, self._targets, self._ends = views
+        self._buffer = buffer
+
+    @classmethod
+    def dump(cls, trie, path):
+        """将字典树冻结为二进制文件"""
+        if hasattr(trie, "root"):
+            adjacency = cls._adjacency_of_trie(trie)
+        else:
+            adjacency = cls._adjacency_of_compact_trie(trie)
+
+        # 广度优先遍历，为结点重新编号
+        offsets, codes, targets, ends = array("I", [0]), array("I"), array("I"), bytearray()
+        queue = [adjacency(None)]
+        for is_end, edges in queue:
+            ends.append(1 if is_end else 0)
+            for code, child in sorted(edges):
+                codes.append(code)
+                targets.append(len(queue))
+                queue.append(adjacency(child))
+            offsets.append(len(codes))
+
+        header = array("I", [0, cls._VERSION, len(ends), len(codes)])
+        if sys.byteorder != "little":
+            for a in (header, offsets, codes, targets):
+                a.byteswap()
+        with open(path, "wb") as file:
+            file.write(cls._MAGIC)
+            file.write(header[1:].tobytes())
+            file.write(offsets.tobytes())
+            file.write(codes.tobytes())
+            file.write(targets.tobytes())
+            file.write(ends)
+
+    @staticmethod
+    def _adjacency_of_trie(trie):
+        def adjacency(node):
+            node = trie.root if node is None else node
+            return node.value is not None, [(ord(ch), child) for ch, child in node.children.items()]
+
+        return adjacency
+
+    @staticmethod
+    def _adjacency_of_compact_trie(trie):
+        shift, mask = trie._SHIFT, (1 << trie._SHIFT) - 1
+        edges = {}
+        for key, child in trie._children.items():
+            edges.setdefault(key >> shift, []).append((key & mask, child))
+
+        def adjacency(node):
+            node = 0 if node is None else node
+            return trie._end[node] == 1, edges.get(node, [])
+
+        return adjacency
+
+    def close(self):
+        for view in (self._offsets, self._codes, self._targets, self._ends, self._buffer):
+            view.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _child(self, node, ch):
+        """返回node经过字符ch到达的子结点编号（如果不存在则返回-1）:O(logK)"""
+        lo, hi = self._offsets[node], self._offsets[node + 1]
+        code = ord(ch)
+        i = bisect_left(self._codes, code, lo, hi)
+        if i < hi and self._codes[i] == code:
+            return self._targets[i]
+        return -1
+
+    def _walk(self, word):
+        node = 0
+        for ch in word:
+            node = self._child(node, ch)
+            if node < 0:
+                return -1
+        return node
+
+    def __contains__(self, word):
+        """判断词语是否存在"""
+        node = self._walk(word)
+        return node >= 0 and self._ends[node] == 1
+
+    def search(self, string):
+        """寻找字符串中从头开始的第1个词语（如果没有找到则返回None）"""
+        node = 0
+        for i, ch in enumerate(string):
+            node = self._child(node, ch)
+            if node < 0:
+                return None
+            if self._ends[node]:
+                return string[:i + 1]
+
+    def start_with(self, string):
+        """寻找字符串中是否有以string开头的"""
+        return self._walk(string) >= 0
@@ -0,0 +1,97 @@
+"""带权并查集 / 势能并查集 (Weighted Disjoint Set Union)
+
+在变长并查集的基础上，为每个元素记录它相对于父节点的势能（偏移量），用于维护形如 x-y=w 的约束关系。
+在路径压缩的过程中同时合成势能，因此任意元素相对于根节点的势能都可以在摊销O(1)的时间内得到。
+
+势能所在的运算默认为加法，也可以通过op、inv、e指定其他的交换群：
+加法约束 x-y=w : WeightedDSU()
+奇偶性约束 x xor y=w : WeightedDSU(op=lambda a, b: a ^ b, inv=lambda a: a, e=0)
+比例约束 x/y=w : WeightedDSU(op=lambda a, b: a * b, inv=lambda a: 1 / a, e=Fraction(1))（from fractions import Fraction，单位元和约束值均使用Fraction以避免浮点误差）
+
+【时间复杂度】
+添加元素：O(1)
+查询元素所在集合及相对势能：O(1)*
+合并两个元素所在集合：O(1)*
+（其中：*为摊销）
+
+【方法说明】
+WeightedDSU(op, inv, e) 构造带权并查集实例
+add(x) 向并查集中添加新的元素x
+find(x) 查询x所属的连通分支
+potential(x) 查询x相对于所在连通分支根节点的势能
+union(x,y,w) 添加约束x-y=w:True=约束成立（合并成功或与已有约束一致）;False=与已有约束矛盾
+diff(x,y) 查询x-y的值（如果x和y不在同一个连通分支则返回None）
+is_connected(x,y) 判断x和y是否在同一个连通分支
+get_size(x) 获取元素x所在连通分支的元素数量
+"""
+
+
+class WeightedDSU:
+    def __init__(self, op=None, inv=None, e=0):
+        self._parent = {}
+        self._size = {}
+        self._potential = {}  # 元素相对于父节点的势能（根节点的势能为单位元）
+        self._op = op if op is not None else (lambda a, b: a + b)
+        self._inv = inv if inv is not None else (lambda a: -a)
+        self._e = e
+
+    def __contains__(self, x):
+        return x in self._parent
+
+    def add(self, x):
+        if x not in self._parent:
+            self._parent[x] = x
+            self._size[x] = 1
+            self._potential[x] = self._e
+
+    def get_size(self, x):
+        return self._size[self.find(x)]
+
+    def find(self, x):
+        """查询x所在的连通分支，并将路径上元素的势能合成为相对于根节点的势能:O(1)*"""
+        parent, potential, op = self._parent, self._potential, self._op
+        path = []
+        while parent[x] != x:
+            path.append(x)
+            x = parent[x]
+        for y in reversed(path):
+            p = parent[y]
+            if p != x:
+                potential[y] = op(potential[y], potential[p])
+                parent[y] = x
+        return x
+
+    def potential(self, x):
+        """查询x相对于所在连通分支根节点的势能:O(1)*"""
+        self.find(x)
+        return self._potential[x]
+
+    def union(self, x, y, w) -> bool:
+        """添加约束x-y=w:O(1)*"""
+        rx, ry = self.find(x), self.find(y)
+        op, inv = self._op, self._inv
+        px, py = self._potential[x], self._potential[y]
+        if rx == ry:
+            return op(px, inv(py)) == w
+
+        # rx-ry = w-(x-rx)+(y-ry)
+        d = op(op(w, inv(px)), py)
+        if self._size[rx] < self._size[ry]:
+            self._parent[rx] = ry
+            self._potential[rx] = d
+            self._size[ry] += self._size.pop(rx)
+        else:
+            self._parent[ry] = rx
+            self._potential[ry] = inv(d)
+            self._size[rx] += self._size.pop(ry)
+        return True
+
+    def diff(self, x, y):
+        """查询x-y的值:O(1)*"""
+        rx, ry = self.find(x), self.find(y)
+        if rx != ry:
+            return None
+        return self._op(self._potential[x], self._inv(self._potential[y]))
+
+    def is_connected(self, x, y):
+        return self.find(x) == self.find(y)
@@ -25,8 +25,18 @@ add(x) 向并查集中添加新的元素x
 find(x) 查询i所属的连通分支
 union(x,y) 合并i和j的连通分支
 get_size(x) 获取元素x所在连通分支的元素数量
+
+【编号变长并查集(InternedDSU)说明】
+适用于百万量级的字符串等元素：在add时为每个新元素分配连续的整数编号（仅需一个字典），
+父节点和连通分支大小使用array('i')按编号存储，合并和查询均在整数数组上进行（非递归的路径减半）。
+InternedDSU() 构造并查集实例
+add(x) 向并查集中添加新的元素x，返回x的编号
+find(x) / union(x,y) / is_connected(x,y) / get_size(x) 与DSU2相同
+components() 批量返回所有连通分支（每个连通分支为元素列表）
 """
 
+from array import array
+
 
 class DSU:
     def __init__(self):
@@ -67,3 +77,72 @@ class DSU:
 
     def is_connected(self, x, y):
         return self.find(x) == self.find(y)
+
+
+class InternedDSU:
+    def __init__(self):
+        self._index = {}  # 元素 -> 编号
+        self._keys = []  # 编号 -> 元素
+        self._parent = array("i")
+        self._size = array("i")
+
+    def __contains__(self, x):
+        return x in self._index
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, x) -> int:
+        if x not in self._index:
+            i = len(self._keys)
+            self._index[x] = i
+            self._keys.append(x)
+            self._parent.append(i)
+            self._size.append(1)
+            return i
+        return self._index[x]
+
+    def _find(self, i: int) -> int:
+        parent = self._parent
+        p = parent[i]
+        while p != i:
+            gp = parent[p]
+            parent[i] = gp
+            i, p = gp, parent[gp]
+        return i
+
+    def get_size(self, x):
+        return self._size[self._find(self._index[x])]
+
+    def find(self, x):
+        return self._keys[self._find(self._index[x])]
+
+    def union(self, x, y):
+        parent, size = self._parent, self._size
+        i, j = self._index[x], self._index[y]
+        while parent[i] != i:
+            parent[i] = i = parent[parent[i]]
+        while parent[j] != j:
+            parent[j] = j = parent[parent[j]]
+        if i == j:
+            return False
+        if size[i] < size[j]:
+            i, j = j, i
+        parent[j] = i
+        size[i] += size[j]
+        return True
+
+    def is_connected(self, x, y):
+        return self._find(self._index[x]) == self._find(self._index[y])
+
+    def components(self):
+        """批量返回所有连通分支:O(N)*"""
+        groups = {}
+        find = self._find
+        for i, x in enumerate(self._keys):
+            r = find(i)
+            if r in groups:
+                groups[r].append(x)
+            else:
+                groups[r] = [x]
+        return list(groups.values())
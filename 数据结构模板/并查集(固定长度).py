@@ -18,6 +18,16 @@ DSU1(n) 构造长度为n的并查集实例
 find(i) 查询i所属的连通分支
 union(i,j) 合并i和j的连通分支
 group_num 计算当前的连通分支数量
+max_group_size 计算最大连通分支包含的元素数量
+union_many(us,vs) 批量合并边(us[k],vs[k])；vs为None时us为[u0,v0,u1,v1,...]形式的边缓冲区，返回成功合并的次数
+connected_components() 一次遍历返回所有元素的连通分支编号（按首次出现顺序从0开始连续编号）
+
+【紧凑并查集(CompactDSU)说明】
+适用于10^7量级的大规模数据：父节点和连通分支大小使用array('i')存储（每个元素4字节），
+查询时使用非递归的路径减半（path halving），不受递归深度限制。
+CompactDSU(n) 构造长度为n的紧凑并查集实例
+find(i) / union(i,j) / is_connected(i,j) / group_num / max_group_size / union_many(us,vs) 与DSU1相同
+connected_components() 与DSU1相同，但返回array('i')
 
 【变长并查集(DSU2)方法说明】
 DSU2() 构造并查集实例
@@ -27,6 +37,8 @@ union(x,y) 合并i和j的连通分支
 get_size(x) 获取元素x所在连通分支的元素数量
 """
 
+from array import array
+
 
 class DSU:
     def __init__(self, n: int):
@@ -34,12 +46,17 @@ class DSU:
         self._array = [i for i in range(n)]
         self._size = [1] * n
         self._group_num = n
+        self._max_size = 1 if n > 0 else 0
 
     def find(self, i: int) -> int:
         """查询i所在的连通分支:O(1)"""
-        if self._array[i] != i:
-            self._array[i] = self.find(self._array[i])
-        return self._array[i]
+        parent = self._array
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        while parent[i] != root:
+            parent[i], i = root, parent[i]
+        return root
 
     def union(self, i: int, j: int) -> bool:
         """合并i和j所属的连通分支:O(1)"""
@@ -49,9 +66,13 @@ class DSU:
             if self._size[i] >= self._size[j]:
                 self._array[j] = i
                 self._size[i] += self._size[j]
+                if self._size[i] > self._max_size:
+                    self._max_size = self._size[i]
             else:
                 self._array[i] = j
                 self._size[j] += self._size[i]
+                if self._size[j] > self._max_size:
+                    self._max_size = self._size[j]
             return True
         else:
             return False
@@ -59,6 +80,137 @@ class DSU:
     def is_connected(self, i: int, j: int) -> bool:
         return self.find(i) == self.find(j)
 
+    def union_many(self, us, vs=None) -> int:
+        """批量合并边(us[k],vs[k])，返回成功合并的次数:O(M)*"""
+        if vs is None:
+            us, vs = us[0::2], us[1::2]
+        parent, size = self._array, self._size
+        max_size = self._max_size
+        merged = 0
+        for i, j in zip(us, vs):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            while parent[j] != j:
+                parent[j] = parent[parent[j]]
+                j = parent[j]
+            if i != j:
+                if size[i] < size[j]:
+                    i, j = j, i
+                parent[j] = i
+                size[i] += size[j]
+                if size[i] > max_size:
+                    max_size = size[i]
+                merged += 1
+        self._max_size = max_size
+        self._group_num -= merged
+        return merged
+
+    def connected_components(self):
+        """计算所有元素的连通分支编号:O(N)*"""
+        parent = self._array
+        labels = [-1] * self._n
+        k = 0
+        for i in range(self._n):
+            r = i
+            while parent[r] != r:
+                parent[r] = parent[parent[r]]
+                r = parent[r]
+            if labels[r] < 0:
+                labels[r] = k
+                k += 1
+            labels[i] = labels[r]
+        return labels
+
+    @property
+    def group_num(self) -> int:
+        """计算连通分支数量:O(1)"""
+        return self._group_num
+
+    @property
+    def max_group_size(self) -> int:
+        """计算最大连通分支包含的数量:O(1)"""
+        return self._max_size
+
+
+class CompactDSU:
+    def __init__(self, n: int):
+        self._n = n
+        self._parent = array("i", range(n))
+        self._size = array("i", [1]) * n
+        self._group_num = n
+        self._max_size = 1 if n > 0 else 0
+
+    def find(self, i: int) -> int:
+        """查询i所在的连通分支（路径减半）:O(1)*"""
+        parent = self._parent
+        p = parent[i]
+        while p != i:
+            gp = parent[p]
+            parent[i] = gp
+            i, p = gp, parent[gp]
+        return i
+
+    def union(self, i: int, j: int) -> bool:
+        """合并i和j所属的连通分支:O(1)*"""
+        i, j = self.find(i), self.find(j)
+        if i == j:
+            return False
+        size = self._size
+        if size[i] < size[j]:
+            i, j = j, i
+        self._parent[j] = i
+        size[i] += size[j]
+        if size[i] > self._max_size:
+            self._max_size = size[i]
+        self._group_num -= 1
+        return True
+
+    def is_connected(self, i: int, j: int) -> bool:
+        return self.find(i) == self.find(j)
+
+    def union_many(self, us, vs=None) -> int:
+        """批量合并边(us[k],vs[k])，返回成功合并的次数:O(M)*"""
+        if vs is None:
+            us, vs = us[0::2], us[1::2]
+        parent, size = self._parent, self._size
+        max_size = self._max_size
+        merged = 0
+        for i, j in zip(us, vs):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            while parent[j] != j:
+                parent[j] = parent[parent[j]]
+                j = parent[j]
+            if i != j:
+                if size[i] < size[j]:
+                    i, j = j, i
+                parent[j] = i
+                size[i] += size[j]
+                if size[i] > max_size:
+                    max_size = size[i]
+                merged += 1
+        self._max_size = max_size
+        self._group_num -= merged
+        return merged
+
+    def connected_components(self):
+        """计算所有元素的连通分支编号:O(N)*"""
+        parent = self._parent
+        labels = array("i", [-1]) * self._n
+        k = 0
+        for i in range(self._n):
+            r = i
+            while parent[r] != r:
+                parent[r] = parent[parent[r]]
+                r = parent[r]
+            if labels[r] < 0:
+                labels[r] = k
+                k += 1
+            labels[i] = labels[r]
+        return labels
+
     @property
     def group_num(self) -> int:
         """计算连通分支数量:O(1)"""
@@ -66,6 +218,5 @@ class DSU:
 
     @property
     def max_group_size(self) -> int:
-        """计算最大连通分支包含的数量:O(N)"""
-        import collections
-        return max(collections.Counter(self._array).values())
+        """计算最大连通分支包含的数量:O(1)"""
+        return self._max_size
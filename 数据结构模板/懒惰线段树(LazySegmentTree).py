@@ -0,0 +1,408 @@
+"""懒惰线段树 (Lazy Segment Tree)
+
+通用的非递归懒惰线段树：结点值构成幺半群(op, e)，懒惰标签是作用在结点值上的映射(mapping)，
+多个懒惰标签之间可以复合(composition)，id为恒等映射。
+所有结点存储在预先分配的数组中（结点x的子结点为2x和2x+1），更新和查询均自底向上非递归地进行。
+
+【参数说明】
+op(a, b) 合并两个结点的值
+e 结点值的单位元：op(a, e) = op(e, a) = a
+mapping(f, x) 将懒惰标签f作用在结点值x上
+composition(f, g) 复合懒惰标签：先作用g再作用f
+id_ 恒等映射的懒惰标签：mapping(id_, x) = x
+
+【时间复杂度】
+构造实例：O(N)
+单点修改、单点查询：O(logN)
+区间修改、区间查询：O(logN)
+
+【方法说明】
+LazySegmentTree(v, op, e, mapping, composition, id_) 构造线段树，v为初始数组或数组长度（初始值为e）
+set(i, x) 将第i个位置的值修改为x
+get(i) 查询第i个位置的值
+query(l, r) 查询第l个到第r个位置（闭区间）的合并结果
+update(l, r, f) 将懒惰标签f作用在第l个到第r个位置（闭区间）上
+update_ranges(ranges, commutative=False) 批量区间修改，ranges为[(l, r, f)]（懒惰标签可以交换顺序时传入commutative=True，批量只打标签并统一重新计算）
+query_ranges(ranges) 批量区间查询，ranges为[(l, r)]，返回查询结果列表（批量先统一下传懒惰标签）
+
+【变式说明】
+LazySegmentTreeForMin(size) = 求最小值线段树：区间取最小值(chmin)+区间查询最小值，位置范围为[0, size]，初始值为inf
+LazySegmentTreeForMax(size) = 求最大值线段树：区间取最大值(chmax)+区间查询最大值，位置范围为[0, size]，初始值为0
+两者与SegmentTreeForMin、SegmentTreeForMax的接口(query_one, query_range, update_one, update_range)相同，
+因为min、max满足交换律和幂等律，所以区间修改时不需要下传懒惰标签（标记永久化）：
+两者的区间修改和区间查询是独立的标记永久化实现（_IdempotentLazySegmentTree），不经过通用的mapping、composition；
+适用于位置范围较小、可以预先分配数组的情况；位置范围极大时请使用延时开点的线段树。
+"""
+
+
+class LazySegmentTree:
+    def __init__(self, v, op, e, mapping, composition, id_):
+        if isinstance(v, int):
+            v = [e] * v
+        self.n = len(v)
+        self.op = op
+        self.e = e
+        self.mapping = mapping
+        self.composition = composition
+        self.id = id_
+
+        self.log = max(self.n - 1, 0).bit_length()
+        self.size = 1 << self.log
+        self.tree = [e] * (2 * self.size)
+        self.lazy = [id_] * self.size
+        self.tree[self.size:self.size + self.n] = v
+        for x in range(self.size - 1, 0, -1):
+            self.tree[x] = op(self.tree[2 * x], self.tree[2 * x + 1])
+
+    def _apply(self, x, f):
+        """将懒惰标签f作用在结点x上"""
+        self.tree[x] = self.mapping(f, self.tree[x])
+        if x < self.size:
+            self.lazy[x] = self.composition(f, self.lazy[x])
+
+    def _push(self, x):
+        """将结点x的懒惰标签下传到子结点"""
+        f = self.lazy[x]
+        if f != self.id:
+            self._apply(2 * x, f)
+            self._apply(2 * x + 1, f)
+            self.lazy[x] = self.id
+
+    def _pull(self, x):
+        """由子结点重新计算结点x的值"""
+        self.tree[x] = self.op(self.tree[2 * x], self.tree[2 * x + 1])
+
+    def set(self, i, x):
+        i += self.size
+        for h in range(self.log, 0, -1):
+            self._push(i >> h)
+        self.tree[i] = x
+        for h in range(1, self.log + 1):
+            self._pull(i >> h)
+
+    def get(self, i):
+        i += self.size
+        for h in range(self.log, 0, -1):
+            self._push(i >> h)
+        return self.tree[i]
+
+    def _push_path(self, l, r):
+        """从根结点向下，下传叶结点l和r-1的所有祖先结点的懒惰标签（已经完整覆盖的结点除外）"""
+        size, tree, lazy = self.size, self.tree, self.lazy
+        mapping, composition, id_ = self.mapping, self.composition, self.id
+        for h in range(self.log, 0, -1):
+            x = l >> h
+            if (x << h) != l and lazy[x] != id_:
+                f = lazy[x]
+                y = 2 * x
+                tree[y] = mapping(f, tree[y])
+                tree[y + 1] = mapping(f, tree[y + 1])
+                if y < size:
+                    lazy[y] = composition(f, lazy[y])
+                    lazy[y + 1] = composition(f, lazy[y + 1])
+                lazy[x] = id_
+            x = (r - 1) >> h
+            if ((r >> h) << h) != r and lazy[x] != id_:
+                f = lazy[x]
+                y = 2 * x
+                tree[y] = mapping(f, tree[y])
+                tree[y + 1] = mapping(f, tree[y + 1])
+                if y < size:
+                    lazy[y] = composition(f, lazy[y])
+                    lazy[y + 1] = composition(f, lazy[y + 1])
+                lazy[x] = id_
+
+    def query(self, l, r):
+        """查询闭区间[l, r]的合并结果:O(logN)"""
+        if l > r:
+            return self.e
+        l += self.size
+        r += self.size + 1
+        self._push_path(l, r)
+
+        tree, op = self.tree, self.op
+        left, right = self.e, self.e
+        while l < r:
+            if l & 1:
+                left = op(left, tree[l])
+                l += 1
+            if r & 1:
+                r -= 1
+                right = op(tree[r], right)
+            l >>= 1
+            r >>= 1
+        return op(left, right)
+
+    def update(self, l, r, f):
+        """将懒惰标签f作用在闭区间[l, r]上:O(logN)"""
+        if l > r:
+            return
+        size, tree, lazy = self.size, self.tree, self.lazy
+        op, mapping, composition = self.op, self.mapping, self.composition
+        l += size
+        r += size + 1
+        self._push_path(l, r)
+
+        l0, r0 = l, r
+        while l < r:
+            if l & 1:
+                tree[l] = mapping(f, tree[l])
+                if l < size:
+                    lazy[l] = composition(f, lazy[l])
+                l += 1
+            if r & 1:
+                r -= 1
+                tree[r] = mapping(f, tree[r])
+                if r < size:
+                    lazy[r] = composition(f, lazy[r])
+            l >>= 1
+            r >>= 1
+        l, r = l0, r0
+
+        for h in range(1, self.log + 1):
+            if ((l >> h) << h) != l:
+                x = l >> h
+                tree[x] = op(tree[2 * x], tree[2 * x + 1])
+            if ((r >> h) << h) != r:
+                x = (r - 1) >> h
+                tree[x] = op(tree[2 * x], tree[2 * x + 1])
+
+    def _push_all(self):
+        """自顶向下下传所有结点的懒惰标签，之后所有结点的值都不再依赖祖先结点的懒惰标签:O(N)"""
+        size, tree, lazy = self.size, self.tree, self.lazy
+        mapping, composition, id_ = self.mapping, self.composition, self.id
+        for x in range(1, size):
+            f = lazy[x]
+            if f != id_:
+                y = 2 * x
+                tree[y] = mapping(f, tree[y])
+                tree[y + 1] = mapping(f, tree[y + 1])
+                if y < size:
+                    lazy[y] = composition(f, lazy[y])
+                    lazy[y + 1] = composition(f, lazy[y + 1])
+                lazy[x] = id_
+
+    def update_ranges(self, ranges, commutative=False):
+        """批量区间修改：ranges为[(l, r, f)]
+        commutative=True表示懒惰标签之间可以交换顺序（如区间加、区间取最大值），此时批量较大时只将懒惰标签作用在各区间对应的结点上，
+        最后自底向上统一重新计算所有结点的值:O(MlogN+N)；否则依次执行区间修改:O(MlogN)"""
+        ranges = list(ranges)
+        if not commutative or len(ranges) * self.log < self.size:
+            update = self.update
+            for l, r, f in ranges:
+                update(l, r, f)
+            return
+        size, tree, lazy = self.size, self.tree, self.lazy
+        op, mapping, composition = self.op, self.mapping, self.composition
+        for l, r, f in ranges:
+            if l > r:
+                continue
+            l += size
+            r += size + 1
+            while l < r:
+                if l & 1:
+                    tree[l] = mapping(f, tree[l])
+                    if l < size:
+                        lazy[l] = composition(f, lazy[l])
+                    l += 1
+                if r & 1:
+                    r -= 1
+                    tree[r] = mapping(f, tree[r])
+                    if r < size:
+                        lazy[r] = composition(f, lazy[r])
+                l >>= 1
+                r >>= 1
+        for x in range(size - 1, 0, -1):
+            tree[x] = mapping(lazy[x], op(tree[2 * x], tree[2 * x + 1]))
+
+    def query_ranges(self, ranges):
+        """批量区间查询：ranges为[(l, r)]，返回查询结果列表
+        批量较大时先用O(N)下传所有懒惰标签，之后每次查询不再需要下传:O(MlogN+N)"""
+        ranges = list(ranges)
+        if len(ranges) * self.log < self.size:
+            query = self.query
+            return [query(l, r) for l, r in ranges]
+        self._push_all()
+        size, tree, op, e = self.size, self.tree, self.op, self.e
+        ans = []
+        for l, r in ranges:
+            left = right = e
+            l += size
+            r += size + 1
+            while l < r:
+                if l & 1:
+                    left = op(left, tree[l])
+                    l += 1
+                if r & 1:
+                    r -= 1
+                    right = op(tree[r], right)
+                l >>= 1
+                r >>= 1
+            ans.append(op(left, right))
+        return ans
+
+
+class _IdempotentLazySegmentTree(LazySegmentTree):
+    """op、mapping、composition为同一个满足交换律和幂等律的二元运算（如min、max）时的线段树：
+    懒惰标签无需下传（标记永久化），查询时合并区间边界叶结点所有祖先结点上的懒惰标签即可。
+    与LazySegmentTree共用数组结构和set、get，但query、update、update_ranges是独立的标记永久化实现，不经过mapping、composition"""
+
+    def __init__(self, v, op, e):
+        super().__init__(v, op, e, op, op, e)
+
+    def query(self, l, r):
+        """查询闭区间[l, r]的合并结果:O(logN)"""
+        if l > r:
+            return self.e
+        size, tree, lazy, op = self.size, self.tree, self.lazy, self.op
+        l += size
+        r += size + 1
+        ans = self.e
+        x, y = l >> 1, (r - 1) >> 1
+        while x:
+            ans = op(op(ans, lazy[x]), lazy[y])
+            x >>= 1
+            y >>= 1
+        while l < r:
+            if l & 1:
+                ans = op(ans, tree[l])
+                l += 1
+            if r & 1:
+                r -= 1
+                ans = op(ans, tree[r])
+            l >>= 1
+            r >>= 1
+        return ans
+
+    def update(self, l, r, f):
+        """将懒惰标签f作用在闭区间[l, r]上:O(logN)"""
+        if l > r:
+            return
+        size, tree, lazy, op = self.size, self.tree, self.lazy, self.op
+        l += size
+        r += size + 1
+        x, y = l >> 1, (r - 1) >> 1
+        while l < r:
+            if l & 1:
+                tree[l] = op(f, tree[l])
+                if l < size:
+                    lazy[l] = op(f, lazy[l])
+                l += 1
+            if r & 1:
+                r -= 1
+                tree[r] = op(f, tree[r])
+                if r < size:
+                    lazy[r] = op(f, lazy[r])
+            l >>= 1
+            r >>= 1
+        while x:
+            tree[x] = op(f, tree[x])
+            tree[y] = op(f, tree[y])
+            x >>= 1
+            y >>= 1
+
+    def _push_all(self):
+        """自顶向下将所有结点的懒惰标签合并到子结点上:O(N)"""
+        size, tree, lazy, op, e = self.size, self.tree, self.lazy, self.op, self.e
+        for x in range(1, size):
+            f = lazy[x]
+            if f != e:
+                y = 2 * x
+                tree[y] = op(f, tree[y])
+                tree[y + 1] = op(f, tree[y + 1])
+                if y < size:
+                    lazy[y] = op(f, lazy[y])
+                    lazy[y + 1] = op(f, lazy[y + 1])
+                lazy[x] = e
+
+    def query_ranges(self, ranges):
+        """批量区间查询：批量较大时先用O(N)合并所有懒惰标签，之后每次查询不再需要合并祖先结点的懒惰标签:O(MlogN+N)"""
+        ranges = list(ranges)
+        if len(ranges) * self.log < self.size:
+            query = self.query
+            return [query(l, r) for l, r in ranges]
+        self._push_all()
+        size, tree, op, e = self.size, self.tree, self.op, self.e
+        ans = []
+        for l, r in ranges:
+            res = e
+            l += size
+            r += size + 1
+            while l < r:
+                if l & 1:
+                    res = op(res, tree[l])
+                    l += 1
+                if r & 1:
+                    r -= 1
+                    res = op(res, tree[r])
+                l >>= 1
+                r >>= 1
+            ans.append(res)
+        return ans
+
+    def update_ranges(self, ranges, commutative=True):
+        """批量区间修改：先只将懒惰标签作用在各区间对应的结点上，最后自底向上统一重新计算所有结点的值:O(MlogN+N)
+        （min、max的懒惰标签总是可以交换顺序，commutative参数不起作用）"""
+        ranges = list(ranges)
+        if len(ranges) * self.log < self.size:
+            super().update_ranges(ranges)
+            return
+        size, tree, lazy, op = self.size, self.tree, self.lazy, self.op
+        for l, r, f in ranges:
+            if l > r:
+                continue
+            l += size
+            r += size + 1
+            while l < r:
+                if l & 1:
+                    tree[l] = op(f, tree[l])
+                    if l < size:
+                        lazy[l] = op(f, lazy[l])
+                    l += 1
+                if r & 1:
+                    r -= 1
+                    tree[r] = op(f, tree[r])
+                    if r < size:
+                        lazy[r] = op(f, lazy[r])
+                l >>= 1
+                r >>= 1
+        for x in range(size - 1, 0, -1):
+            tree[x] = op(op(tree[2 * x], tree[2 * x + 1]), lazy[x])
+
+
+class LazySegmentTreeForMin(_IdempotentLazySegmentTree):
+    """求最小值线段树：区域查询和更新最小值"""
+
+    def __init__(self, size):
+        super().__init__(size + 1, min, float("inf"))
+
+    def query_one(self, query):
+        return self.get(query)
+
+    def query_range(self, start, end):
+        return self.query(start, end)
+
+    def update_one(self, query, data):
+        self.update(query, query, data)
+
+    def update_range(self, start, end, data):
+        self.update(start, end, data)
+
+
+class LazySegmentTreeForMax(_IdempotentLazySegmentTree):
+    """求最大值线段树：区域查询和更新最大值"""
+
+    def __init__(self, size):
+        super().__init__([0] * (size + 1), max, float("-inf"))
+
+    def query_one(self, query):
+        return self.get(query)
+
+    def query_range(self, start, end):
+        return self.query(start, end)
+
+    def update_one(self, query, data):
+        self.update(query, query, data)
+
+    def update_range(self, start, end, data):
+        self.update(start, end, data)
@@ -0,0 +1,245 @@
+"""有序列表 (Sorted List)
+
+将所有元素按顺序分别存储在若干个有序的桶中，每个桶的长度在[1, 2*LOAD]之间，同时记录每个桶的最大值。
+查找元素时先二分查找所在的桶，再在桶中二分查找；按排名查找时使用记录各桶长度的树状数组。
+不依赖sortedcontainers等第三方库。
+
+【时间复杂度】
+构造实例：O(NlogN)
+添加、删除元素：O(logN+LOAD)
+查找元素、查询排名：O(logN)
+按排名查找元素：O(logN)
+
+【方法说明】
+SortedList(iterable) 构造有序列表实例
+add(x) 添加元素x
+update(iterable) 批量添加元素（只排序一次）
+remove(x) 删除一个元素x（如果不存在则抛出ValueError）
+discard(x) 删除一个元素x（如果不存在则不做任何操作）
+pop(i=-1) 删除并返回排名为i的元素
+bisect_left(x) 查询小于x的元素数量
+bisect_right(x) 查询小于等于x的元素数量
+count(x) 查询元素x的数量
+index(x) 查询第一个元素x的排名（如果不存在则抛出ValueError）
+irange(minimum, maximum, inclusive) 依次返回在[minimum, maximum]之间的元素（inclusive控制两端是否包含）
+sl[i] 查询排名为i的元素（i从0开始，支持负数）
+"""
+
+import bisect
+import itertools
+
+
+class SortedList:
+    _LOAD = 500  # 桶长度的基准值：桶的长度超过2*LOAD时分裂
+
+    def __init__(self, iterable=()):
+        self._lists = []  # 有序的桶
+        self._maxes = []  # 每个桶的最大值
+        self._index = None  # 记录各桶长度的树状数组（桶的数量变化时失效，使用时重新构造）
+        self._len = 0
+        self.update(iterable)
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self._lists)
+
+    def __reversed__(self):
+        return itertools.chain.from_iterable(reversed(lst) for lst in reversed(self._lists))
+
+    def __repr__(self):
+        return "SortedList(" + str(list(self)) + ")"
+
+    def __contains__(self, x):
+        pos = bisect.bisect_left(self._maxes, x)
+        if pos == len(self._maxes):
+            return False
+        lst = self._lists[pos]
+        return lst[bisect.bisect_left(lst, x)] == x
+
+    def update(self, iterable):
+        """批量添加元素：与已有元素合并后只排序一次，再重新分桶:O((N+M)log(N+M))"""
+        values = list(iterable)
+        if not values:
+            return
+        if self._len:
+            values.extend(self)
+        values.sort()
+        load = self._LOAD
+        self._lists = [values[i:i + load] for i in range(0, len(values), load)]
+        self._maxes = [lst[-1] for lst in self._lists]
+        self._index = None
+        self._len = len(values)
+
+    # ---------- 记录各桶长度的树状数组 ----------
+
+    def _build_index(self):
+        tree = [0] + [len(lst) for lst in self._lists]
+        n = len(tree) - 1
+        for i in range(1, n + 1):
+            j = i + (i & -i)
+            if j <= n:
+                tree[j] += tree[i]
+        self._index = tree
+
+    def _index_add(self, pos, x):
+        """第pos个桶的长度增加x"""
+        tree = self._index
+        if tree is not None:
+            i = pos + 1
+            while i < len(tree):
+                tree[i] += x
+                i += i & -i
+
+    def _loc(self, pos, idx):
+        """将(桶编号, 桶内位置)转换为排名"""
+        if self._index is None:
+            self._build_index()
+        tree = self._index
+        ans = idx
+        while pos > 0:
+            ans += tree[pos]
+            pos &= pos - 1
+        return ans
+
+    def _pos(self, i):
+        """将排名转换为(桶编号, 桶内位置)"""
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("list index out of range")
+        if self._index is None:
+            self._build_index()
+        tree = self._index
+        n = len(tree) - 1
+        pos = 0
+        step = 1 << (n.bit_length() - 1)
+        while step:
+            if pos + step <= n and tree[pos + step] <= i:
+                pos += step
+                i -= tree[pos]
+            step >>= 1
+        return pos, i
+
+    # ---------- 添加和删除 ----------
+
+    def add(self, x):
+        """添加元素x:O(logN+LOAD)"""
+        lists, maxes = self._lists, self._maxes
+        if not maxes:
+            lists.append([x])
+            maxes.append(x)
+            self._index = None
+            self._len = 1
+            return
+
+        pos = bisect.bisect_right(maxes, x)
+        if pos == len(maxes):
+            pos -= 1
+            lists[pos].append(x)
+            maxes[pos] = x
+        else:
+            bisect.insort(lists[pos], x)
+        self._len += 1
+
+        # 桶过长时分裂为两个桶
+        lst = lists[pos]
+        if len(lst) > 2 * self._LOAD:
+            half = lst[self._LOAD:]
+            del lst[self._LOAD:]
+            lists.insert(pos + 1, half)
+            maxes[pos] = lst[-1]
+            maxes.insert(pos + 1, half[-1])
+            self._index = None
+        else:
+            self._index_add(pos, 1)
+
+    def _delete(self, pos, idx):
+        """删除第pos个桶中的第idx个元素"""
+        lst = self._lists[pos]
+        x = lst.pop(idx)
+        self._len -= 1
+        if lst:
+            self._maxes[pos] = lst[-1]
+            self._index_add(pos, -1)
+        else:
+            del self._lists[pos]
+            del self._maxes[pos]
+            self._index = None
+        return x
+
+    def discard(self, x) -> bool:
+        """删除一个元素x:True=成功删除;False=没有该元素"""
+        pos = bisect.bisect_left(self._maxes, x)
+        if pos == len(self._maxes):
+            return False
+        idx = bisect.bisect_left(self._lists[pos], x)
+        if self._lists[pos][idx] != x:
+            return False
+        self._delete(pos, idx)
+        return True
+
+    def remove(self, x):
+        if not self.discard(x):
+            raise ValueError("{0!r} not in list".format(x))
+
+    def pop(self, i=-1):
+        """删除并返回排名为i的元素"""
+        return self._delete(*self._pos(i))
+
+    # ---------- 查询 ----------
+
+    def bisect_left(self, x) -> int:
+        """查询小于x的元素数量:O(logN)"""
+        pos = bisect.bisect_left(self._maxes, x)
+        if pos == len(self._maxes):
+            return self._len
+        return self._loc(pos, bisect.bisect_left(self._lists[pos], x))
+
+    def bisect_right(self, x) -> int:
+        """查询小于等于x的元素数量:O(logN)"""
+        pos = bisect.bisect_right(self._maxes, x)
+        if pos == len(self._maxes):
+            return self._len
+        return self._loc(pos, bisect.bisect_right(self._lists[pos], x))
+
+    def count(self, x) -> int:
+        return self.bisect_right(x) - self.bisect_left(x)
+
+    def index(self, x) -> int:
+        i = self.bisect_left(x)
+        if i == self._len or self[i] != x:
+            raise ValueError("{0!r} not in list".format(x))
+        return i
+
+    def __getitem__(self, i):
+        """查询排名为i的元素:O(logN)"""
+        if isinstance(i, slice):
+            return list(self)[i]
+        pos, idx = self._pos(i)
+        return self._lists[pos][idx]
+
+    def __delitem__(self, i):
+        self._delete(*self._pos(i))
+
+    def irange(self, minimum=None, maximum=None, inclusive=(True, True)):
+        """依次返回在minimum和maximum之间的元素（None表示不限制）"""
+        lists, maxes = self._lists, self._maxes
+        if minimum is None:
+            pos, idx = 0, 0
+        elif inclusive[0]:
+            pos = bisect.bisect_left(maxes, minimum)
+            idx = bisect.bisect_left(lists[pos], minimum) if pos < len(lists) else 0
+        else:
+            pos = bisect.bisect_right(maxes, minimum)
+            idx = bisect.bisect_right(lists[pos], minimum) if pos < len(lists) else 0
+
+        while pos < len(lists):
+            lst = lists[pos]
+            for k in range(idx, len(lst)):
+                x = lst[k]
+                if maximum is not None and (x > maximum or (x == maximum and not inclusive[1])):
+                    return
+                yield x
+            pos, idx = pos + 1, 0
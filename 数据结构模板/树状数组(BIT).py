@@ -17,12 +17,17 @@
 区间查询 O(logN) : 输入下标x和y，求出a[x]和a[y]的和
 
 【方法说明】
-BIT(n) 构造一个长度为n的树状数组
+BIT(n, keep_values=False) 构造一个长度为n的树状数组（keep_values=True时额外保存原数组的镜像，单点修改只需一次add）
+BIT.from_array(values) 依据数组values（values[0]为第1个数）构造树状数组:O(N)
+get(i) 查询数组中第i个数的值
 update(i, x) 将数组中的第i个数更新为x
 add(i, x) 将数组中第i个数增加x
 range_add(l, r, x) 将数组中第l个数到第r个数分别加x
 query(i) 查询数组中第i个数的前缀和
 range_query(l, r) 查询数组中第l个到第r个数的区间和
+query_many(indices) 批量查询数组中第indices[k]个数的前缀和，返回前缀和列表
+add_many(indices, deltas) 批量将数组中第indices[k]个数增加deltas[k]
+lower_bound(k) 查询前缀和不小于k的最小下标（要求数组中的数均非负，不存在时返回n+1）:O(logN)
 _lowbit(x) 计算二进制中从最低位向高位中出现的第1个非0位对应的二进制数值
 
 【变式说明】
@@ -30,6 +35,8 @@ BIT = 标准树状数组，支持：单点修改、单点查询、区间查询
 RangeUpdateBIT = 第1种变式树状数组（差分数组），支持：单点修改、区间修改、单点查询
 RangeQueryUpdateBIT = 第2种变式树状数组（差分数组），支持：单点修改、区间修改、单点查询、区间查询
 BIT2D = 二维树状数组
+SparseBIT2D = 离线稀疏二维树状数组（需预先给出所有修改的坐标），支持：单点修改、二维区间查询，空间复杂度O(PlogP)
+FenwickMultiset = 基于标准树状数组的有序多重集合（值域需预先给出），支持：插入、删除、第k小、排名
 
 参考文献：https://www.cnblogs.com/xenny/p/9739600.html
 
@@ -39,20 +46,37 @@ LeetCode 0308 = 二维树状数组
 LeetCode 0315 = 标准树状数组
 """
 
+import bisect
+
 
 class BIT:
-    def __init__(self, n: int):
+    def __init__(self, n: int, keep_values: bool = False):
         self.n = n
         self._tree = [0] * (n + 1)
+        self._values = [0] * (n + 1) if keep_values else None  # 原数组的镜像（用于O(1)获取单点值）
 
     @staticmethod
     def _lowbit(x):
         return x & (-x)
 
+    def get(self, i: int) -> int:
+        """查询数组中第i个数的值:O(1)（保存镜像时）/O(logN)"""
+        if self._values is not None:
+            return self._values[i]
+        tree = self._tree
+        ans = tree[i]
+        j, stop = i - 1, i - BIT._lowbit(i)
+        while j > stop:
+            ans -= tree[j]
+            j -= BIT._lowbit(j)
+        return ans
+
     def update(self, i: int, x: int):
-        self.add(i, x - (self.query(i) - self.query(i - 1)))
+        self.add(i, x - self.get(i))
 
     def add(self, i: int, x: int):
+        if self._values is not None:
+            self._values[i] += x
         while i <= self.n:
             self._tree[i] += x
             i += BIT._lowbit(i)
@@ -67,6 +91,73 @@ class BIT:
     def range_query(self, l: int, r: int) -> int:
         return self.query(r) - self.query(l - 1)
 
+    @classmethod
+    def from_array(cls, values, keep_values: bool = False):
+        """依据数组构造树状数组：每个结点只将自己的值累加到父结点一次:O(N)"""
+        bit = cls(len(values), keep_values)
+        tree, n = bit._tree, bit.n
+        tree[1:] = values
+        if keep_values:
+            bit._values[1:] = values
+        for i in range(1, n + 1):
+            j = i + (i & -i)
+            if j <= n:
+                tree[j] += tree[i]
+        return bit
+
+    def query_many(self, indices) -> list:
+        """批量查询前缀和：查询数量较多时先用O(N)的线性遍历计算所有前缀和:O(min(MlogN, N+M))"""
+        indices = list(indices)
+        tree, n = self._tree, self.n
+        if len(indices) * n.bit_length() < n:
+            ans = []
+            for i in indices:
+                s = 0
+                while i > 0:
+                    s += tree[i]
+                    i &= i - 1
+                ans.append(s)
+            return ans
+        prefix = [0] * (n + 1)
+        for i in range(1, n + 1):
+            prefix[i] = prefix[i & (i - 1)] + tree[i]
+        return [prefix[i] for i in indices]
+
+    def add_many(self, indices, deltas):
+        """批量单点增加：修改数量较多时先合并所有增量，再用O(N)的线性遍历沿父结点传递:O(min(MlogN, N+M))"""
+        indices, deltas = list(indices), list(deltas)
+        tree, n = self._tree, self.n
+        if self._values is not None:
+            for i, x in zip(indices, deltas):
+                self._values[i] += x
+        if len(indices) * n.bit_length() < n:
+            for i, x in zip(indices, deltas):
+                while i <= n:
+                    tree[i] += x
+                    i += i & -i
+            return
+        d = [0] * (n + 1)
+        for i, x in zip(indices, deltas):
+            d[i] += x
+        for i in range(1, n + 1):
+            if d[i]:
+                tree[i] += d[i]
+                j = i + (i & -i)
+                if j <= n:
+                    d[j] += d[i]
+
+    def lower_bound(self, k: int) -> int:
+        """倍增查询前缀和不小于k的最小下标:O(logN)"""
+        tree, n = self._tree, self.n
+        pos = 0
+        step = 1 << (n.bit_length() - 1) if n else 0
+        while step:
+            if pos + step <= n and tree[pos + step] < k:
+                pos += step
+                k -= tree[pos]
+            step >>= 1
+        return pos + 1
+
 
 class RangeUpdateBIT:
     def __init__(self, n: int):
@@ -78,7 +169,7 @@ class RangeUpdateBIT:
         return x & (-x)
 
     def update(self, i: int, x: int):
-        self.add(i, x - (self.query(i) - self.query(i - 1)))
+        self.range_add(i, i, x - self.query(i))
 
     def add(self, i: int, x: int):
         while i <= self.n:
@@ -107,8 +198,16 @@ class RangeQueryUpdateBIT:
     def _lowbit(x):
         return x & (-x)
 
+    def get(self, i: int) -> int:
+        """查询数组中第i个数的值（即差分数组D的前缀和）:O(logN)"""
+        ans = 0
+        while i > 0:
+            ans += self._sum1[i]
+            i -= RangeQueryUpdateBIT._lowbit(i)
+        return ans
+
     def update(self, i: int, x: int):
-        self.add(i, x - (self.query(i) - self.query(i - 1)))
+        self.range_add(i, i, x - self.get(i))
 
     def add(self, i: int, x: int):
         t = i
@@ -134,44 +233,164 @@ class RangeQueryUpdateBIT:
 
 
 class BIT2D:
-    def __init__(self, n1: int, n2: int):
+    def __init__(self, n1: int, n2: int, keep_values: bool = False):
         self.n1 = n1
         self.n2 = n2
         self._tree = [[0] * (n2 + 1) for _ in range(n1 + 1)]
+        self._values = [[0] * (n2 + 1) for _ in range(n1 + 1)] if keep_values else None  # 原数组的镜像
 
     @staticmethod
     def _lowbit(x):
         return x & (-x)
 
+    def get(self, i: int, j: int) -> int:
+        """查询第i行第j列的值:O(1)（保存镜像时）/O(logN*logM)"""
+        if self._values is not None:
+            return self._values[i][j]
+
+        # 一维的单点值为tree[i]减去tree[i-1]、tree[i-1-lowbit(i-1)]...（直到i-lowbit(i)为止），二维为两个维度的乘积
+        tree = self._tree
+        j_stop = j - BIT2D._lowbit(j)
+        ans = 0
+        ii, sign, i_stop = i, 1, i - BIT2D._lowbit(i)
+        while ii > i_stop:
+            row = tree[ii]
+            s = row[j]
+            jj = j - 1
+            while jj > j_stop:
+                s -= row[jj]
+                jj -= BIT2D._lowbit(jj)
+            ans += sign * s
+            ii = i - 1 if sign == 1 else ii - BIT2D._lowbit(ii)
+            sign = -1
+        return ans
+
     def update(self, i: int, j: int, x: int):
-        now = self.query(i, j) - self.query(i - 1, j) - self.query(i, j - 1) + self.query(i - 1, j - 1)
-        self.add(i, j, x - now)
+        self.add(i, j, x - self.get(i, j))
 
     def add(self, i: int, j: int, x: int):
-        i_lst, j_lst = [], []
-        while i <= self.n1:
-            i_lst.append(i)
+        if self._values is not None:
+            self._values[i][j] += x
+        tree, n1, n2 = self._tree, self.n1, self.n2
+        while i <= n1:
+            row = tree[i]
+            jj = j
+            while jj <= n2:
+                row[jj] += x
+                jj += BIT2D._lowbit(jj)
             i += BIT2D._lowbit(i)
-        while j <= self.n2:
-            j_lst.append(j)
-            j += BIT2D._lowbit(j)
-        for ii in i_lst:
-            for jj in j_lst:
-                self._tree[ii][jj] += x
 
     def query(self, i: int, j: int) -> int:
-        i_lst, j_lst = [], []
+        tree = self._tree
+        ans = 0
         while i > 0:
-            i_lst.append(i)
+            row = tree[i]
+            jj = j
+            while jj > 0:
+                ans += row[jj]
+                jj -= BIT2D._lowbit(jj)
             i -= BIT2D._lowbit(i)
-        while j > 0:
-            j_lst.append(j)
-            j -= BIT2D._lowbit(j)
-        ans = 0
-        for ii in i_lst:
-            for jj in j_lst:
-                ans += self._tree[ii][jj]
         return ans
 
     def range_query(self, i1: int, j1: int, i2: int, j2: int) -> int:
         return self.query(i2, j2) - self.query(i2, j1 - 1) - self.query(i1 - 1, j2) + self.query(i1 - 1, j1 - 1)
+
+
+class SparseBIT2D:
+    """离线稀疏二维树状数组：第一维为压缩后的x坐标上的树状数组，其中每个结点只记录会被修改到的y坐标，
+    并在这些y坐标上各自维护一个压缩后的一维树状数组"""
+
+    def __init__(self, points):
+        self._xs = sorted({x for x, _ in points})
+        n = self.n = len(self._xs)
+        ys = [[] for _ in range(n + 1)]
+        for x, y in points:
+            i = bisect.bisect_left(self._xs, x) + 1
+            while i <= n:
+                ys[i].append(y)
+                i += i & (-i)
+        self._ys = [sorted(set(lst)) for lst in ys]
+        self._tree = [[0] * (len(lst) + 1) for lst in self._ys]
+
+    def add(self, x, y, v):
+        """将坐标(x,y)上的值增加v（(x,y)必须是预先给出的坐标，否则抛出KeyError）:O(log²P)"""
+        i = bisect.bisect_left(self._xs, x) + 1
+        if i > self.n or self._xs[i - 1] != x:
+            raise KeyError("point not registered")
+        # 后续结点的y坐标列表包含当前结点的y坐标列表，所以只需要在修改前检查第一个结点
+        ys = self._ys[i]
+        j = bisect.bisect_left(ys, y)
+        if j == len(ys) or ys[j] != y:
+            raise KeyError("point not registered")
+        while i <= self.n:
+            ys, tree = self._ys[i], self._tree[i]
+            j = bisect.bisect_left(ys, y) + 1
+            while j < len(tree):
+                tree[j] += v
+                j += j & (-j)
+            i += i & (-i)
+
+    def query(self, x, y):
+        """查询所有满足x'<=x且y'<=y的坐标(x',y')上的值之和:O(log²P)"""
+        ans = 0
+        i = bisect.bisect_right(self._xs, x)
+        while i > 0:
+            tree = self._tree[i]
+            j = bisect.bisect_right(self._ys[i], y)
+            while j > 0:
+                ans += tree[j]
+                j -= j & (-j)
+            i -= i & (-i)
+        return ans
+
+    def range_query(self, x1, y1, x2, y2):
+        """查询x1<=x<=x2且y1<=y<=y2的所有坐标上的值之和（坐标为整数）:O(log²P)"""
+        return self.query(x2, y2) - self.query(x2, y1 - 1) - self.query(x1 - 1, y2) + self.query(x1 - 1, y1 - 1)
+
+
+class FenwickMultiset:
+    """有序多重集合：将值域坐标压缩后，用树状数组记录每个值出现的次数"""
+
+    def __init__(self, values):
+        self._values = sorted(set(values))  # 值域
+        self._index = {v: i + 1 for i, v in enumerate(self._values)}
+        self._bit = BIT(len(self._values))
+        self._count = [0] * (len(self._values) + 1)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, x):
+        return x in self._index and self._count[self._index[x]] > 0
+
+    def count(self, x) -> int:
+        return self._count[self._index[x]] if x in self._index else 0
+
+    def insert(self, x, n: int = 1):
+        """插入n个x（x必须在值域中）:O(logN)"""
+        i = self._index[x]
+        self._count[i] += n
+        self._size += n
+        self._bit.add(i, n)
+
+    def erase(self, x, n: int = 1) -> bool:
+        """删除至多n个x:True=成功删除;False=没有该值"""
+        i = self._index.get(x)
+        if i is None or self._count[i] == 0:
+            return False
+        n = min(n, self._count[i])
+        self._count[i] -= n
+        self._size -= n
+        self._bit.add(i, -n)
+        return True
+
+    def kth(self, k: int):
+        """查询第k小（k从1开始）的值:O(logN)"""
+        if not 1 <= k <= self._size:
+            raise IndexError("kth out of range")
+        return self._values[self._bit.lower_bound(k) - 1]
+
+    def rank(self, x) -> int:
+        """查询小于x的值的数量:O(logN)"""
+        return self._bit.query(bisect.bisect_left(self._values, x))
@@ -3,6 +3,8 @@
 LeetCode 0699
 """
 
+import bisect
+
 
 class SegmentTreeForMax:
     """求最大值线段树：区域查询和更新最大值"""
@@ -19,9 +21,108 @@ class SegmentTreeForMax:
             self.val = 0  # 当前结点最小值
             self.lazy = 0  # 懒惰计算标签（即未计算的子结点最小值）
 
-    def __init__(self, size):
-        """初始化线段树实例"""
+    def __init__(self, size, max_nodes=None):
+        """初始化线段树实例：max_nodes为同时存在的结点数量上限（None为不限制）"""
         self.root = self._Node(0, size)
+        self._index = None  # 坐标压缩模式下：原始坐标 -> 压缩后的坐标
+        self._pool = []  # 已释放的结点，用于复用
+        self._max_nodes = max_nodes
+        self._live_nodes = 1
+        self._peak_nodes = 1
+
+    @property
+    def live_nodes(self):
+        """当前存在的结点数量"""
+        return self._live_nodes
+
+    @property
+    def peak_nodes(self):
+        """历史上同时存在的结点数量的最大值"""
+        return self._peak_nodes
+
+    def _split(self, node, mid):
+        """为结点创建两个子结点（优先复用已释放的结点），没有子结点的结点下所有位置的值均为当前结点的值"""
+        children = []
+        for start, end in ((node.start, mid), (mid + 1, node.end)):
+            if self._pool:
+                child = self._pool.pop()
+                child.start, child.end = start, end
+                child.left = child.right = None
+                child.lazy = 0
+            else:
+                child = self._Node(start, end)
+            child.val = node.val
+            children.append(child)
+        node.left, node.right = children
+        self._live_nodes += 2
+        if self._live_nodes > self._peak_nodes:
+            self._peak_nodes = self._live_nodes
+
+    def _count_splits(self, node, start, end, pos1, pos2):
+        """计算更新[pos1, pos2]时需要分裂的结点数量（node为None表示尚未创建的结点）"""
+        if start == pos1 and end == pos2:
+            return 0
+        mid = (start + end) // 2
+        if node is None or node.left is None:
+            count, left, right = 1, None, None
+        else:
+            count, left, right = 0, node.left, node.right
+        if pos2 <= mid:
+            return count + self._count_splits(left, start, mid, pos1, pos2)
+        if pos1 >= mid + 1:
+            return count + self._count_splits(right, mid + 1, end, pos1, pos2)
+        return (count + self._count_splits(left, start, mid, pos1, mid)
+                + self._count_splits(right, mid + 1, end, mid + 1, pos2))
+
+    def _reserve(self, start, end):
+        """在修改任何结点之前检查结点数量上限，避免更新进行到一半时失败而使线段树处于不一致的状态"""
+        root = self.root
+        if self._live_nodes + 2 * self._count_splits(root, root.start, root.end, start, end) > self._max_nodes:
+            raise MemoryError("segment tree node budget exceeded")
+
+    def _collapse(self, node):
+        """如果两个子结点都没有子结点且值相同，则释放两个子结点"""
+        left, right = node.left, node.right
+        if left.left is None and right.left is None and left.val == right.val:
+            self._free_children(node)
+
+    def _free_children(self, node):
+        """释放结点的所有子孙结点"""
+        stack = [node.left, node.right]
+        node.left = node.right = None
+        node.lazy = 0
+        while stack:
+            child = stack.pop()
+            if child.left is not None:
+                stack.append(child.left)
+                stack.append(child.right)
+            self._pool.append(child)
+            self._live_nodes -= 1
+
+    @classmethod
+    def from_points(cls, points):
+        """构造坐标压缩的线段树实例：points为所有更新、查询的端点，之后只能使用这些端点作为更新、查询的位置"""
+        points = sorted(set(points))
+        tree = cls(max(len(points) - 1, 0))
+        tree._index = {point: i for i, point in enumerate(points)}
+        return tree
+
+    @classmethod
+    def offline(cls, operations):
+        """离线执行所有操作并返回所有查询的结果:O(KlogK)（K为不同端点的数量）
+        operations为操作列表，每个操作为("update", start, end, data)或("query", start, end)"""
+        points = []
+        for operation in operations:
+            points.append(operation[1])
+            points.append(operation[2])
+        tree = cls.from_points(points)
+        ans = []
+        for operation in operations:
+            if operation[0] == "update":
+                tree.update_range(operation[1], operation[2], operation[3])
+            else:
+                ans.append(tree.query_range(operation[1], operation[2]))
+        return ans
 
     def _push_down(self, node):
         """计算当前结点的懒惰计算标签：更新子结点的值+更新子结点的懒惰计算标签+清空当前结点的懒惰计算标签"""
@@ -36,6 +137,9 @@ class SegmentTreeForMax:
         """更新数据"""
         # 当前区间正好为当前结点的情况：即不需要继续分裂的情况
         if node.start == pos1 and node.end == pos2:
+            # 更新后当前结点下所有位置的值均为data的情况：释放当前结点的所有子结点
+            if node.left is not None and max(node.val, data) == data:
+                self._free_children(node)
             node.val = max(node.val, data)
             node.lazy = max(node.lazy, data)
 
@@ -45,9 +149,7 @@ class SegmentTreeForMax:
 
             # 创建两个子结点
             if node.left is None:
-                node.left = self._Node(node.start, mid)
-            if node.right is None:
-                node.right = self._Node(mid + 1, node.end)
+                self._split(node, mid)
 
             # 计算当前结点的懒惰计算标签
             self._push_down(node)
@@ -64,47 +166,195 @@ class SegmentTreeForMax:
                 self._update(node.left, pos1, mid, data)
                 self._update(node.right, mid + 1, pos2, data)
 
+            # 合并值相同的子结点
+            self._collapse(node)
+
     def _query(self, node, start, end):
-        """查询数据"""
+        """查询数据（不创建结点，也不下传懒惰计算标签）"""
 
         # 当前区间正好为当前结点的情况：即不需要继续分裂的情况
         if node.start == start and node.end == end:
             return node.val
 
         # 当前结点没有子结点的情况：即当前结点下所有位置的结果一致的情况
-        elif node.left is None and node.right is None:
+        elif node.left is None:
             return node.val
 
-        # 当前区间为当前结点的部分的情况：即需要继续分裂的情况
+        # 当前区间为当前结点的部分的情况：即需要继续分裂的情况（子结点的结果需要合并当前结点的懒惰计算标签）
         else:
             mid = (node.start + node.end) // 2
-
-            # 创建两个子结点
-            if node.left is None:
-                node.left = self._Node(node.start, mid)
-            if node.right is None:
-                node.right = self._Node(mid + 1, node.end)
-
-            # 计算当前结点的懒惰计算标签
-            self._push_down(node)
-
-            # 查询当前结果的最小值
             if end <= mid:
-                return self._query(node.left, start, end)
+                return max(node.lazy, self._query(node.left, start, end))
             elif start >= mid + 1:
-                return self._query(node.right, start, end)
+                return max(node.lazy, self._query(node.right, start, end))
             else:
-                return max(self._query(node.left, start, mid),
+                return max(node.lazy,
+                           self._query(node.left, start, mid),
                            self._query(node.right, mid + 1, end))
 
     def query_one(self, query):
+        if self._index is not None:
+            query = self._index[query]
         return self._query(self.root, query, query)
 
     def query_range(self, start, end):
+        if self._index is not None:
+            start, end = self._index[start], self._index[end]
         return self._query(self.root, start, end)
 
     def update_one(self, query, data):
+        if self._index is not None:
+            query = self._index[query]
+        if self._max_nodes is not None:
+            self._reserve(query, query)
         self._update(self.root, query, query, data)
 
     def update_range(self, start, end, data):
+        if self._index is not None:
+            start, end = self._index[start], self._index[end]
+        if self._max_nodes is not None:
+            self._reserve(start, end)
         self._update(self.root, start, end, data)
+
+    def _update_batch(self, node, items):
+        """批量更新：items为[(pos1, pos2, data)]，所有区间均在当前结点的范围内；所有区间一起向下遍历一次线段树，共享经过的结点"""
+        full = None  # 正好覆盖当前结点的区间的data合并结果
+        partial = []
+        for item in items:
+            if item[0] == node.start and item[1] == node.end:
+                full = item[2] if full is None else max(full, item[2])
+            else:
+                partial.append(item)
+
+        if partial:
+            mid = (node.start + node.end) // 2
+            if node.left is None:
+                self._split(node, mid)
+            self._push_down(node)
+            left, right = [], []
+            for item in partial:
+                pos1, pos2, data = item
+                node.val = max(node.val, data)
+                if pos2 <= mid:
+                    left.append(item)
+                elif pos1 >= mid + 1:
+                    right.append(item)
+                else:
+                    left.append((pos1, mid, data))
+                    right.append((mid + 1, pos2, data))
+            if left:
+                self._update_batch(node.left, left)
+            if right:
+                self._update_batch(node.right, right)
+            self._collapse(node)
+
+        if full is not None:
+            self._update(node, node.start, node.end, full)
+
+    @staticmethod
+    def _merge_updates(items):
+        """将批量更新压缩为互不相交的分段：将所有端点坐标压缩后，按data从大到小依次为尚未确定值的基本区间赋值
+        （使用并查集跳过已赋值的基本区间），再合并值相同的相邻基本区间:O(KlogK)"""
+        points = sorted({pos for pos1, pos2, _ in items for pos in (pos1, pos2 + 1)})
+        rank = {pos: i for i, pos in enumerate(points)}
+        m = len(points) - 1
+        value = [None] * m  # 第i个基本区间[points[i], points[i+1]-1]的值
+        nxt = list(range(m + 1))  # 并查集：从第i个基本区间开始的第一个尚未赋值的基本区间
+        for pos1, pos2, data in sorted(items, key=lambda item: item[2], reverse=True):
+            i, j = rank[pos1], rank[pos2 + 1]
+            while True:
+                while nxt[i] != i:
+                    nxt[i] = nxt[nxt[i]]
+                    i = nxt[i]
+                if i >= j:
+                    break
+                value[i] = data
+                nxt[i] = i + 1
+
+        runs = []
+        i = 0
+        while i < m:
+            if value[i] is None:
+                i += 1
+                continue
+            j = i + 1
+            while j < m and value[j] == value[i]:
+                j += 1
+            runs.append((points[i], points[j] - 1, value[i]))
+            i = j
+        return runs
+
+    def _pieces(self):
+        """将线段树展开为连续的分段：返回每段的起点列表和每段的值列表（合并了祖先结点的懒惰计算标签）:O(结点数量)"""
+        starts, values = [], []
+        stack = [(self.root, float("-inf"))]  # (结点, 所有祖先结点的懒惰计算标签的合并结果)
+        while stack:
+            node, acc = stack.pop()
+            if node.left is None:
+                starts.append(node.start)
+                values.append(max(node.val, acc))
+            else:
+                acc = max(acc, node.lazy)
+                stack.append((node.right, acc))
+                stack.append((node.left, acc))
+        return starts, values
+
+    def update_ranges(self, ranges):
+        """批量区间更新：ranges为[(start, end, data)]；先压缩为互不相交的分段（每段的值为覆盖它的data的最大值），
+        再让所有分段一起向下遍历一次线段树，经过的每个结点只访问一次
+        （设置了结点数量上限时依次执行更新，保证每次更新要么完整执行，要么不修改线段树）"""
+        index = self._index
+        if self._max_nodes is not None:
+            for start, end, data in ranges:
+                if index is not None:
+                    start, end = index[start], index[end]
+                self._reserve(start, end)
+                self._update(self.root, start, end, data)
+            return
+        if index is not None:
+            items = [(index[start], index[end], data) for start, end, data in ranges]
+        else:
+            items = [(start, end, data) for start, end, data in ranges]
+        if items:
+            self._update_batch(self.root, self._merge_updates(items))
+
+    def query_ranges(self, ranges):
+        """批量区间查询：ranges为[(start, end)]，返回查询结果列表
+        批量较大时先将线段树展开为连续的分段，在分段上构造ST表（稀疏表），之后每次查询只需要两次二分查找:O(结点数量+PlogP+KlogP)（P为分段数量）"""
+        index = self._index
+        if index is not None:
+            ranges = [(index[start], index[end]) for start, end in ranges]
+        else:
+            ranges = list(ranges)
+        root = self.root
+        if self._live_nodes > len(ranges) * max(root.end - root.start, 1).bit_length():
+            query = self._query
+            return [query(root, start, end) for start, end in ranges]
+
+        starts, values = self._pieces()
+        table = [values]  # table[k][i]为第i段开始的2^k段的结果
+        k = 1
+        while 2 * k <= len(values):
+            last = table[-1]
+            table.append(list(map(max, last[:len(last) - k], last[k:])))
+            k *= 2
+        ans = []
+        for start, end in ranges:
+            i = bisect.bisect_right(starts, start) - 1
+            j = bisect.bisect_right(starts, end) - 1
+            level = (j - i + 1).bit_length() - 1
+            row = table[level]
+            ans.append(max(row[i], row[j - (1 << level) + 1]))
+        return ans
+
+
+if __name__ == "__main__":
+    # 超出结点数量上限的更新不修改线段树
+    tree = SegmentTreeForMax(100, max_nodes=3)
+    tree.update_range(0, 50, 7)
+    try:
+        tree.update_range(10, 20, 9)
+    except MemoryError:
+        pass
+    print(tree.query_range(0, 50))  # 7
+    print(tree.query_range(10, 20))  # 7
@@ -0,0 +1,219 @@
+"""线段树 (Segment Tree)
+
+核心思想（Lazy思想）：对整个结点进行的操作，先在结点上做标记，而并非真正执行，直到根据查询操作的需要分成两部分
+
+【适用条件】
+query_fn满足结合律和交换律，update_fn可以分配到query_fn上，且连续的两次更新可以用update_fn合并为一次更新：
+update_fn(query_fn(a, b), v) = query_fn(update_fn(a, v), update_fn(b, v))
+update_fn(update_fn(a, v1), v2) = update_fn(a, update_fn(v1, v2))
+例如：区间加+区间最大值(max, add)、区间加+区间最小值(min, add)、区间取最大值+区间最大值(max, max)
+
+【参数说明】
+self.N = 线段树的数组长度
+self.H = 线段树的高度
+self.update_fn = 更新线段树的函数
+self.query_fn = 查询线段树的函数
+self.query_identity = 查询的单位元：query_fn(a, query_identity) = a
+self.update_identity = 更新的单位元：update_fn(a, update_identity) = a
+self.tree = [0] * (2 * N)  # 线段树数组
+self.lazy = [update_identity] * N  # 线段树lazy属性
+
+【方法说明】
+SegmentTree(N, update_fn, query_fn, query_identity, update_identity, values) 构造一棵长度为N的线段树（values为初始数组，默认全为0）
+_apply(x, val) 计算x的值，并将x的子节点的计算填写到lazy属性中
+_pull(x) 计算叶节点x及其祖先节点的值（计算lazy属性）
+_push(x) 从根节点向下计算x的祖先节点的lazy属性中的值
+update(l, r, h) 将从l到r（闭区间）的值更新为update_fn(原值, h)
+query(l, r) 查询从l到r（闭区间）的值
+update_ranges(ranges, commutative=False) 批量更新，ranges为[(l, r, h)]（各次更新可以交换顺序时传入commutative=True，批量只更新对应节点并统一计算）
+query_ranges(ranges) 批量查询，ranges为[(l, r)]，返回查询结果列表（批量先统一计算所有lazy属性）
+
+【类说明】
+SegmentTree = 基于两个数组实现的非递归线段树
+
+"""
+
+
+class SegmentTree(object):
+    def __init__(self, N, update_fn, query_fn, query_identity=0, update_identity=0, values=None):
+        self.N = N
+        self.update_fn = update_fn
+        self.query_fn = query_fn
+        self.query_identity = query_identity
+        self.update_identity = update_identity
+
+        # 计算线段树的高度
+        self.H = 1
+        while (1 << self.H) < N:
+            self.H += 1
+
+        # 初始化线段树数组和lazy属性数组（lazy属性对应所有内部节点）
+        self.tree = [0] * (2 * N)
+        self.lazy = [update_identity] * N
+        if values is not None:
+            self.tree[N:] = values
+            for x in range(N - 1, 0, -1):
+                self.tree[x] = query_fn(self.tree[x * 2], self.tree[x * 2 + 1])
+
+    def _apply(self, x, val):
+        """计算x的值，并将x的子节点的计算填写到lazy属性中"""
+        self.tree[x] = self.update_fn(self.tree[x], val)
+        if x < self.N:
+            self.lazy[x] = self.update_fn(self.lazy[x], val)  # 每个节点的lazy属性都是给子节点用的
+
+    def _pull(self, x):
+        """计算叶节点x及其祖先节点的值"""
+        tree, lazy = self.tree, self.lazy
+        query_fn, update_fn, update_identity = self.query_fn, self.update_fn, self.update_identity
+        while x > 1:
+            x >>= 1
+            val = query_fn(tree[x * 2], tree[x * 2 + 1])
+            if lazy[x] != update_identity:
+                val = update_fn(val, lazy[x])
+            tree[x] = val
+
+    def _push(self, x):
+        """从根节点向下计算x的祖先节点的lazy属性中的值"""
+        lazy, update_identity = self.lazy, self.update_identity
+        for h in range(self.H, 0, -1):
+            y = x >> h
+            if y > 0 and lazy[y] != update_identity:
+                self._apply(y * 2, lazy[y])
+                self._apply(y * 2 + 1, lazy[y])
+                lazy[y] = update_identity
+
+    def update(self, l, r, h):
+        """将从L到R（闭区间）的值更新为update_fn(原值, h)"""
+
+        # 计算L和R对应的叶节点坐标
+        l += self.N
+        r += self.N
+
+        # 计算从根节点向下计算x的祖先节点的lazy属性中的值（保证更新顺序与lazy属性中已有的更新顺序一致）
+        self._push(l)
+        self._push(r)
+
+        # 从叶节点开始向上更新值
+        L0, R0 = l, r
+        while l <= r:
+            if l & 1 == 1:
+                self._apply(l, h)
+                l += 1
+            if r & 1 == 0:
+                self._apply(r, h)
+                r -= 1
+            l >>= 1
+            r >>= 1
+
+        # 计算叶节点x及其祖先节点的值
+        self._pull(L0)
+        self._pull(R0)
+
+    def query(self, l, r):
+        """查询从L到R（闭区间）的值"""
+
+        # 计算L和R对应的叶节点坐标
+        l += self.N
+        r += self.N
+
+        # 计算从根节点向下计算x的祖先节点的lazy属性中的值（将lazy属性中的值计算到节点中）
+        self._push(l)
+        self._push(r)
+
+        # 查询指定范围的值
+        tree, query_fn = self.tree, self.query_fn
+        ans = self.query_identity
+        while l <= r:
+            if l & 1 == 1:
+                ans = query_fn(ans, tree[l])
+                l += 1
+            if r & 1 == 0:
+                ans = query_fn(ans, tree[r])
+                r -= 1
+            l >>= 1
+            r >>= 1
+        return ans
+
+    def _push_all(self):
+        """从根节点向下计算所有节点的lazy属性中的值:O(N)"""
+        lazy, update_identity = self.lazy, self.update_identity
+        for x in range(1, self.N):
+            if lazy[x] != update_identity:
+                self._apply(x * 2, lazy[x])
+                self._apply(x * 2 + 1, lazy[x])
+                lazy[x] = update_identity
+
+    def update_ranges(self, ranges, commutative=False):
+        """批量更新：ranges为[(l, r, h)]
+        commutative=True表示各次更新可以交换顺序（如区间加、区间取最大值），此时批量较大时只更新各区间对应的节点及其lazy属性，
+        最后自底向上统一计算所有节点的值:O(MlogN+N)；否则依次执行更新:O(MlogN)"""
+        ranges = list(ranges)
+        if not commutative or len(ranges) * self.H < self.N:
+            update = self.update
+            for l, r, h in ranges:
+                update(l, r, h)
+            return
+        N, tree, lazy = self.N, self.tree, self.lazy
+        query_fn, update_fn, update_identity = self.query_fn, self.update_fn, self.update_identity
+        for l, r, h in ranges:
+            l += N
+            r += N
+            while l <= r:
+                if l & 1 == 1:
+                    tree[l] = update_fn(tree[l], h)
+                    if l < N:
+                        lazy[l] = update_fn(lazy[l], h)
+                    l += 1
+                if r & 1 == 0:
+                    tree[r] = update_fn(tree[r], h)
+                    if r < N:
+                        lazy[r] = update_fn(lazy[r], h)
+                    r -= 1
+                l >>= 1
+                r >>= 1
+        for x in range(N - 1, 0, -1):
+            val = query_fn(tree[x * 2], tree[x * 2 + 1])
+            if lazy[x] != update_identity:
+                val = update_fn(val, lazy[x])
+            tree[x] = val
+
+    def query_ranges(self, ranges):
+        """批量查询：ranges为[(l, r)]，返回查询结果列表
+        批量较大时先用O(N)计算所有节点的lazy属性中的值，之后每次查询不再需要_push:O(MlogN+N)"""
+        ranges = list(ranges)
+        if len(ranges) * self.H < self.N:
+            query = self.query
+            return [query(l, r) for l, r in ranges]
+        self._push_all()
+        N, tree, query_fn, query_identity = self.N, self.tree, self.query_fn, self.query_identity
+        ans = []
+        for l, r in ranges:
+            l += N
+            r += N
+            res = query_identity
+            while l <= r:
+                if l & 1 == 1:
+                    res = query_fn(res, tree[l])
+                    l += 1
+                if r & 1 == 0:
+                    res = query_fn(res, tree[r])
+                    r -= 1
+                l >>= 1
+                r >>= 1
+            ans.append(res)
+        return ans
+
+
+if __name__ == "__main__":
+    def add_(a, b):
+        return a + b
+
+
+    st = SegmentTree(8, add_, max, float("-inf"), 0)
+    st.update(3, 5, 1)
+    st.update(4, 7, 2)
+    print(st.query(0, 2))  # 0
+    print(st.query(2, 5))  # 3
+    print(st.query(6, 7))  # 2
+    st.update_ranges([(0, 1, 3), (1, 2, 1)], commutative=True)
+    print(st.query_ranges([(0, 0), (1, 2), (0, 7)]))  # [3, 4, 4]
@@ -1,27 +1,214 @@
 class Permutation:
+    """模数为质数且n小于模数时，使用阶乘及其乘法逆元的缓存列表计算，每次查询O(1)；
+    模数为质数且n不小于模数时，使用卢卡斯定理(Lucas)：模数不超过_LUCAS_TABLE_SIZE时缓存小于模数的阶乘，每次查询O(log_p(n))，
+    模数更大时直接计算每一位的组合数C(ni, mi)，需要O(min(mi, ni-mi))次乘法和一次乘法逆元；
+    模数不是质数时，使用扩展卢卡斯定理：对模数的每个质数幂p^k分别计算（缓存大小为p^k的表），再用中国剩余定理合并，每次查询O(log(n))"""
+
+    _LUCAS_TABLE_SIZE = 1 << 20  # 卢卡斯定理中缓存小于模数的阶乘的模数上限
+
     def __init__(self, mod=10 ** 9 + 7):
         self._mod = mod
         self._size = 0
+        self._prime = self._is_prime(mod)  # 模数是否为质数
 
         self._factorial = [1]  # 阶乘缓存列表 : self.fact[i] = i!
-        self._factorial_inv = [1]  # 阶乘的乘法逆元缓存列表
+        self._factorial_inv = [1]  # 阶乘的乘法逆元缓存列表（仅模数为质数时有效）
+
+        self._prime_powers = None  # 模数的质因数分解[(p, k, p^k)]（第一次使用时计算）
+        self._tables = {}  # 扩展卢卡斯定理的缓存表 : p^k -> 不含质因数p的数的前缀积
+
+    def _extend(self, n):
+        """将阶乘缓存列表扩充到至少包含n!（容量至少翻倍以摊销扩充次数，但不会因此超过模数-1）
+        只对最大的阶乘计算一次乘法逆元，再由 1/(i-1)! = i * (1/i!) 反向递推其余阶乘的乘法逆元:O(N+logMOD)"""
+        mod = self._mod
+        old, n = self._size, max(n, min(2 * self._size, mod - 1))
+        factorial = self._factorial
+        x = factorial[-1]
+        for i in range(old + 1, n + 1):
+            x = x * i % mod
+            factorial.append(x)
+
+        inv = [0] * (n - old)  # 不小于模数的阶乘为0，没有乘法逆元
+        top = min(n, mod - 1)
+        x = pow(factorial[top], mod - 2, mod)
+        for i in range(top, old, -1):
+            inv[i - old - 1] = x
+            x = x * i % mod
+        self._factorial_inv.extend(inv)
+        self._size = n
+
+    def _factorize(self):
+        """计算并缓存模数的质因数分解"""
+        if self._prime_powers is None:
+            factors = []
+            x, p = self._mod, 2
+            while p * p <= x:
+                if x % p == 0:
+                    k, pk = 0, 1
+                    while x % p == 0:
+                        x //= p
+                        k, pk = k + 1, pk * p
+                    factors.append((p, k, pk))
+                p += 1
+            if x > 1:
+                factors.append((x, 1, x))
+            self._prime_powers = factors
+        return self._prime_powers
+
+    @staticmethod
+    def _is_prime(n):
+        """米勒-拉宾素性测试（使用前12个质数为底，n<3.3*10^24时结果是确定的）"""
+        if n < 2:
+            return False
+        bases = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+        for p in bases:
+            if n % p == 0:
+                return n == p
+        d, s = n - 1, 0
+        while d % 2 == 0:
+            d, s = d // 2, s + 1
+        for a in bases:
+            x = pow(a, d, n)
+            if x == 1 or x == n - 1:
+                continue
+            for _ in range(s - 1):
+                x = x * x % n
+                if x == n - 1:
+                    break
+            else:
+                return False
+        return True
+
+    def _lucas(self, n, m):
+        """卢卡斯定理：C(n, m) = C(n%p, m%p) * C(n//p, m//p) (mod p)"""
+        p = self._mod
+        if p <= self._LUCAS_TABLE_SIZE and p - 1 > self._size:
+            self._extend(p - 1)
+        factorial, factorial_inv = self._factorial, self._factorial_inv
+        ans = 1
+        while m:
+            ni, mi = n % p, m % p
+            if mi > ni:
+                return 0
+            if ni <= self._size:
+                ans = ans * factorial[ni] * factorial_inv[mi] * factorial_inv[ni - mi] % p
+            else:
+                ans = ans * self._comb_direct(ni, mi) % p
+            n //= p
+            m //= p
+        return ans
+
+    def _comb_direct(self, n, m):
+        """不使用阶乘缓存列表，直接计算C(n, m)（n小于模数）:O(min(m, n-m)+logMOD)"""
+        mod = self._mod
+        numerator = denominator = 1
+        for i in range(min(m, n - m)):
+            numerator = numerator * (n - i) % mod
+            denominator = denominator * (i + 1) % mod
+        return numerator * pow(denominator, mod - 2, mod) % mod
+
+    def _table(self, p, pk):
+        """不含质因数p的数的前缀积（模p^k）：table[i] = ∏{1<=j<=i, p∤j} j"""
+        table = self._tables.get(pk)
+        if table is None:
+            table = [1] * pk
+            x = 1
+            for i in range(1, pk):
+                if i % p:
+                    x = x * i % pk
+                table[i] = x
+            self._tables[pk] = table
+        return table
+
+    @staticmethod
+    def _factorial_pk(n, p, pk, table):
+        """计算n!除去所有质因数p后的值（模p^k）：n! / p^v = f(n//p) * table[p^k-1]^(n//p^k) * table[n%p^k]"""
+        ans = 1
+        while n:
+            ans = ans * pow(table[-1], n // pk, pk) * table[n % pk] % pk
+            n //= p
+        return ans
+
+    @staticmethod
+    def _factorial_exponent(n, p):
+        """计算n!中质因数p的次数（勒让德公式）"""
+        ans = 0
+        while n:
+            n //= p
+            ans += n
+        return ans
+
+    def _ex_lucas(self, n, m, arrange):
+        """扩展卢卡斯定理：对每个质数幂p^k计算 n!/(n-m)! 或 n!/(m!(n-m)!) 模p^k的值，再用中国剩余定理合并"""
+        mod = self._mod
+        ans = 0
+        for p, k, pk in self._factorize():
+            e = self._factorial_exponent(n, p) - self._factorial_exponent(n - m, p)
+            if not arrange:
+                e -= self._factorial_exponent(m, p)
+            if e >= k:
+                continue
+            table = self._table(p, pk)
+            x = self._factorial_pk(n, p, pk, table) * pow(self._factorial_pk(n - m, p, pk, table), -1, pk)
+            if not arrange:
+                x *= pow(self._factorial_pk(m, p, pk, table), -1, pk)
+            x = x * pow(p, e, pk) % pk
+            rest = mod // pk
+            ans += x * rest * pow(rest, -1, pk)
+        return ans % mod
 
     def factorial(self, n):
         """计算阶乘"""
         if n > self._size:
-            for i in range(self._size + 1, n + 1):
-                self._factorial.append((self._factorial[-1] * i) % self._mod)
-                self._factorial_inv.append(pow(self._factorial[-1], self._mod - 2, self._mod))
-            self._size = n
+            self._extend(n)
         return self._factorial[n]
 
+    def factorial_inv(self, n):
+        """计算阶乘的乘法逆元"""
+        if n > self._size:
+            self._extend(n)
+        return self._factorial_inv[n]
+
     def arrange(self, n, m):
-        """排列数公式(n>=m)"""
-        return self.factorial(n) // self.factorial(n - m)
+        """排列数公式（m<0或m>n时为0）:O(1)"""
+        if m < 0 or m > n:
+            return 0
+        if not self._prime:
+            return self._ex_lucas(n, m, True)
+        if n >= self._mod:
+            if m >= self._mod:  # 连续m个整数的乘积中一定有模数的倍数
+                return 0
+            return self._lucas(n, m) * self.factorial(m) % self._mod
+        if n > self._size:
+            self._extend(n)
+        return self._factorial[n] * self._factorial_inv[n - m] % self._mod
 
     def comb(self, n, m):
-        """组合数公式(n>=m)"""
-        return self.arrange(n, m) // self.factorial(m)
+        """组合数公式（m<0或m>n时为0）:O(1)"""
+        if m < 0 or m > n:
+            return 0
+        if not self._prime:
+            return self._ex_lucas(n, m, False)
+        if n >= self._mod:
+            return self._lucas(n, m)
+        if n > self._size:
+            self._extend(n)
+        return self._factorial[n] * self._factorial_inv[m] % self._mod * self._factorial_inv[n - m] % self._mod
+
+    def comb_many(self, ns, ms):
+        """批量计算组合数：返回[comb(n, m) for n, m in zip(ns, ms)]，阶乘缓存列表只扩充一次:O(K+max(ns))"""
+        ns, ms = list(ns), list(ms)
+        if not ns:
+            return []
+        top = max(ns)
+        if top >= self._mod or not self._prime:
+            comb = self.comb
+            return [comb(n, m) for n, m in zip(ns, ms)]
+        if top > self._size:
+            self._extend(top)
+        mod, factorial, factorial_inv = self._mod, self._factorial, self._factorial_inv
+        return [factorial[n] * factorial_inv[m] % mod * factorial_inv[n - m] % mod if 0 <= m <= n else 0
+                for n, m in zip(ns, ms)]
 
 
 if __name__ == "__main__":